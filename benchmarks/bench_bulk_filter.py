@@ -0,0 +1,42 @@
+"""Benchmark for selecting files from a synthetic list of 1M paths.
+
+Compares filtering every path through generator steps with looking up candidates in the
+indexes of :code:`Files`.
+
+Run with :code:`python benchmarks/bench_bulk_filter.py [amount]`.
+"""
+import sys
+import time
+from pathlib import Path
+
+from palgen.ingest import Folder, Suffix
+from palgen.machinery import Pipeline
+from palgen.machinery.index import Files
+
+EXTENSIONS = ('cpp', 'hpp', 'h', 'py', 'txt', 'tar.gz', 'json', 'toml')
+
+
+def synthetic(amount: int) -> list[Path]:
+    return [Path(f"/project/src/module{idx % 997}/{('third_party', 'lib', 'core')[idx % 3]}/"
+                 f"file{idx}.{EXTENSIONS[idx % len(EXTENSIONS)]}")
+            for idx in range(amount)]
+
+
+def measure(name: str, fnc) -> None:
+    start = time.perf_counter()
+    result = fnc()
+    print(f"{name:<32} {(time.perf_counter() - start) * 1000:9.1f} ms  ({len(result)} files)")
+
+
+def main(amount: int):
+    paths = synthetic(amount)
+    pipeline = Pipeline >> (Suffix('*.[ch]pp', unix=True) & ~Folder('third_party'))
+
+    measure("per path", lambda: pipeline(paths, max_jobs=1))
+
+    files = Files(paths)
+    measure("index (cold)", lambda: pipeline(files, max_jobs=1))
+    measure("index (warm)", lambda: pipeline(files, max_jobs=1))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,60 @@
+"""Benchmark for flattening large generated configs with :code:`CompressKeys`
+and nesting them again with :code:`ExpandKeys`, compared to the former recursive implementation.
+
+Run with :code:`python benchmarks/bench_compress_keys.py [tables]`.
+"""
+import sys
+import timeit
+
+from palgen.ingest import CompressKeys, ExpandKeys
+
+
+def recursive(data, namespace=None, separator='.'):
+    if namespace is None:
+        namespace = []
+
+    if not isinstance(data, dict):
+        return
+
+    if any(not isinstance(v, dict) for v in data.values()):
+        yield separator.join(namespace[:-1]), namespace[-1], data
+        return
+
+    for key, value in data.items():
+        yield from recursive(value, namespace + [key], separator)
+
+
+def wide(amount: int) -> dict:
+    # many tables a few levels deep, ie. error codes grouped by module
+    return {f'module{module}': {f'group{group}': {f'code{code}': {'value': code, 'message': 'Something went wrong'}
+                                                  for code in range(amount // 100)}
+                                for group in range(10)}
+            for module in range(10)}
+
+
+def deep(amount: int) -> dict:
+    # few tables many levels deep
+    data: dict = {'value': 0}
+    for level in range(min(amount, sys.getrecursionlimit() // 2)):
+        data = {f'level{level}': data, f'sibling{level}': {'value': level}}
+    return data
+
+
+def measure(name: str, fnc) -> None:
+    seconds = min(timeit.repeat(fnc, number=1, repeat=5))
+    print(f"{name:<28} {seconds * 1000:8.2f} ms")
+
+
+def main(amount: int):
+    for shape, data in (('wide', wide(amount)), ('deep', deep(amount))):
+        compressed = list(CompressKeys(data))
+        assert compressed == list(recursive(data))
+
+        print(f"{shape}: {len(compressed)} tables")
+        measure('recursive', lambda: list(recursive(data)))  # pylint: disable=cell-var-from-loop
+        measure('CompressKeys', lambda: list(CompressKeys(data)))  # pylint: disable=cell-var-from-loop
+        measure('ExpandKeys', lambda: ExpandKeys(compressed))  # pylint: disable=cell-var-from-loop
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,45 @@
+"""Micro-benchmark for matching paths against filters with many needles.
+
+Run with :code:`python benchmarks/bench_filter.py`.
+"""
+import re
+import timeit
+from pathlib import Path
+
+from palgen.ingest.filter import Filter, Folder, Suffix
+
+FILES = [Path(f"src/module{idx % 100}/sub{idx % 7}/file{idx}.{('cpp', 'hpp', 'h', 'py', 'txt')[idx % 5]}")
+         for idx in range(20_000)]
+SUFFIXES = [f".ext{idx}" for idx in range(40)] + ['.hpp', '*.h*']
+FOLDERS = [f"vendor{idx}" for idx in range(40)] + ['sub3', '^third_party']
+
+
+def legacy(needles: list, other: str) -> bool:
+    # matching every needle separately, as done before needles were compiled
+    return any(re.match(needle, other) if isinstance(needle, re.Pattern) else needle == other
+               for needle in needles)
+
+
+def run(name: str, fnc) -> None:
+    seconds = min(timeit.repeat(fnc, number=1, repeat=5))
+    print(f"{name:<20} {seconds * 1000:8.1f} ms")
+
+
+def main():
+    suffix = Suffix(*SUFFIXES, unix=True)
+    folder = Folder(*FOLDERS, unix=True)
+
+    run("suffix (legacy)", lambda: [file for file in FILES if legacy(suffix.needles, file.suffix)])
+    run("suffix", lambda: [file for file in FILES if suffix.matches(file)])
+    run("folder (legacy)", lambda: [file for file in FILES
+                                    if any(legacy(folder.needles, part) for part in file.parts)])
+    run("folder", lambda: [file for file in FILES if folder.matches(file)])
+
+    exact = Filter(*(f"name{idx}" for idx in range(100)))
+    names = [file.name for file in FILES]
+    run("exact (legacy)", lambda: [name for name in names if legacy(exact.needles, name)])
+    run("exact", lambda: [name for name in names if exact.match_str(name)])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark for parsing JSON descriptors with every installed backend and
+for decoding them straight into a pydantic schema.
+
+Run with :code:`python benchmarks/bench_json.py [documents]`.
+"""
+import sys
+import timeit
+
+from pydantic import BaseModel
+
+from palgen.machinery.formats import JSON_BACKENDS, json_backend, loads_json
+
+
+class Field(BaseModel):
+    name: str
+    offset: int
+    flags: list[str]
+
+
+class Descriptor(BaseModel):
+    name: str
+    version: int
+    fields: list[Field]
+
+
+def document(idx: int) -> bytes:
+    fields = ','.join(f'{{"name": "field{entry}", "offset": {entry * 4}, "flags": ["a", "b"]}}'
+                      for entry in range(100))
+    return f'{{"name": "descriptor{idx}", "version": {idx}, "fields": [{fields}]}}'.encode()
+
+
+def measure(name: str, fnc) -> None:
+    seconds = min(timeit.repeat(fnc, number=1, repeat=3))
+    print(f"{name:<24} {seconds * 1000:8.1f} ms")
+
+
+def main(amount: int):
+    documents = [document(idx) for idx in range(amount)]
+
+    for backend in JSON_BACKENDS:
+        try:
+            json_backend(backend)
+        except ImportError:
+            print(f"{backend:<24} not installed")
+            continue
+
+        # pylint: disable=cell-var-from-loop
+        measure(backend, lambda: [loads_json(data, backend) for data in documents])
+        measure(f"{backend} + validate",
+                lambda: [Descriptor.model_validate(loads_json(data, backend)) for data in documents])
+
+    measure("schema", lambda: [Descriptor.model_validate_json(data) for data in documents])
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,45 @@
+"""Memory benchmark for ingesting large files with :code:`Raw` and :code:`Raw(mmap=True)`.
+
+Each file is hashed as it is ingested. Reported is the peak of memory allocated by Python,
+which does not include pages of memory mapped files.
+
+Run with :code:`python benchmarks/bench_mmap.py [files] [megabytes per file]`.
+"""
+import hashlib
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from palgen.ingest import Raw
+
+
+def measure(name: str, ingest: Raw, files: list[Path]) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    for _, content in ingest(files):
+        hashlib.md5(content).hexdigest()
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<12} {elapsed * 1000:8.1f} ms  peak {peak / 2**20:8.2f} MiB")
+
+
+def main(amount: int, megabytes: int):
+    with tempfile.TemporaryDirectory() as folder:
+        files = []
+        for idx in range(amount):
+            path = Path(folder) / f"asset{idx}.bin"
+            path.write_bytes(bytes(range(256)) * (megabytes * 4096))
+            files.append(path)
+
+        measure("read", Raw(), files)
+        measure("mmap", Raw(mmap=True), files)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 16,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 8)
@@ -0,0 +1,33 @@
+"""Benchmark for the :code:`Relative` and :code:`Absolute` path steps compared to
+deriving every path through pathlib's public API.
+
+Run with :code:`python benchmarks/bench_path_steps.py [paths]`.
+"""
+import sys
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+
+from palgen.ingest import Absolute, Relative
+
+
+def measure(name: str, fnc) -> None:
+    seconds = min(timeit.repeat(fnc, number=1, repeat=3))
+    print(f"{name:<24} {seconds * 1000:8.1f} ms")
+
+
+def main(amount: int):
+    root = Path('/home/user/project')
+    extension = SimpleNamespace(root_path=root)
+    files = [root / 'src' / f'module{idx % 100}' / f'sub{idx % 7}' / f'file{idx}.cpp' for idx in range(amount)]
+    relative = [file.relative_to(root) for file in files]
+
+    print(f"{amount} paths")
+    measure('Path.relative_to', lambda: [file.relative_to(root) for file in files])
+    measure('Relative', lambda: list(Relative(extension, files)))
+    measure('root / path', lambda: [root / file for file in relative])
+    measure('Absolute', lambda: list(Absolute(extension, relative)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
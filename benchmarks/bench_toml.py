@@ -0,0 +1,34 @@
+"""Benchmark for parsing TOML documents with every installed backend.
+
+Run with :code:`python benchmarks/bench_toml.py [documents]`.
+"""
+import sys
+import timeit
+
+from palgen.machinery.formats import TOML_BACKENDS, loads_toml, toml_backend
+
+
+def document(idx: int) -> bytes:
+    entries = '\n'.join(f'[error.code{entry}]\nvalue = {entry}\nmessage = "Something went wrong ({entry})"\n'
+                        f'tags = ["a", "b", "c"]\nseverity = {{ level = {entry % 5}, fatal = false }}\n'
+                        for entry in range(50))
+    return f'# document {idx}\n{entries}'.encode()
+
+
+def main(amount: int):
+    documents = [document(idx) for idx in range(amount)]
+
+    for backend in TOML_BACKENDS:
+        try:
+            toml_backend(backend)
+        except ImportError:
+            print(f"{backend:<8} not installed")
+            continue
+
+        seconds = min(timeit.repeat(lambda: [loads_toml(data, backend) for data in documents],  # pylint: disable=cell-var-from-loop
+                                    number=1, repeat=3))
+        print(f"{backend:<8} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -9,6 +9,9 @@ from palgen.ingest import Suffixes, Relative
 class Build(Extension):
     """ Very simple build system. Compiles with as many jobs as possible, links with one. """
 
+    # compile only after the embedded resources have been generated
+    after = ["embed"]
+
     class Settings(Model):
         standard: int = 20
 
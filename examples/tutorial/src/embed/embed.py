@@ -15,7 +15,7 @@ class Embed(Extension):
     ingest = (Sources                       # Paths to all files
               >> Suffixes('.embed', position=0)  # Select files with .embed as first extension (ie foo.embed.bar)
               >> Relative                       # Convert paths to relative paths
-              >> Raw)                           # Read in files as raw bytes
+              >> Raw(mmap=True))                # Map files into memory instead of copying them
 
     def transform(self, data: Iterable[tuple[Path, bytes]]):
         for file, content in data:
@@ -1,5 +1,4 @@
 import logging
-import os
 import sys
 from gettext import gettext
 from pathlib import Path
@@ -15,6 +14,8 @@ from palgen.schemas.palgen import PalgenSettings
 from ..interface import Extension
 from ..loaders import AST, Python
 from ..machinery import find_backwards
+from ..machinery.jobserver import pass_fds
+from ..machinery.resources import cpu_count
 from ..palgen import Palgen
 from .log import set_min_level
 from .util import ListParam
@@ -119,7 +120,7 @@ class CommandLoader(click.Group):
 @click.option('-v', "--version", help="Show palgen version", is_flag=True)
 @click.option('--debug/--no-debug', default=False)
 @click.option('-j', '--jobs',
-              help=f"Amount of parallel tasks to use. Defaults to {os.cpu_count()}",
+              help=f"Amount of parallel tasks to use. Defaults to {cpu_count()}",
               default=None, type=int)
 @click.option("-c", "--config",
               help="Path to project configuration.",
@@ -205,4 +206,5 @@ def _run_directly(importer: Path):
 
     #! workaround
     check_call(["palgen", *args],
-               cwd=find_backwards("palgen.toml", source_dir=importer.parent).parent)
+               cwd=find_backwards("palgen.toml", source_dir=importer.parent).parent,
+               pass_fds=pass_fds())
@@ -1,8 +1,13 @@
-from .filter import Filter, Folder, Name, Nothing, Passthrough, Stem, Suffix, Suffixes
+from .cache import cached
+from .content import Contains, Magic, Matches
+from .filter import And, Filter, Folder, Name, Not, Nothing, Or, Passthrough, Stem, Suffix, Suffixes
+from .head import FrontMatter, Head
 from .loader import Empty, Ingest, Json, Raw, Text, Toml
 from .path import Absolute, Relative
-from .transform import CompressKeys
+from .stream import Csv, JsonLines, Lines, Span
+from .transform import CompressKeys, ExpandKeys
 
-__all__ = ['Filter', 'Folder', 'Stem', 'Suffix', 'Suffixes', 'Name',
-           'Passthrough', 'Nothing', 'Ingest', 'Empty', 'Raw', 'Text',
-           'Json', 'Toml', 'Relative', 'Absolute', 'CompressKeys']
+__all__ = ['Filter', 'Folder', 'Stem', 'Suffix', 'Suffixes', 'Name', 'And', 'Or', 'Not',
+           'Contains', 'Matches', 'Magic', 'Passthrough', 'Nothing', 'Ingest', 'Empty', 'Raw', 'Text',
+           'Json', 'Toml', 'Head', 'FrontMatter', 'Lines', 'JsonLines', 'Csv', 'Span', 'Relative', 'Absolute',
+           'CompressKeys', 'ExpandKeys', 'cached']
@@ -0,0 +1,135 @@
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+from ..machinery.virtual import VirtualPath
+from .loader import Ingest
+from .memo import options_of
+
+_logger = logging.getLogger(__name__)
+
+# bump this whenever the layout or key of cache entries changes
+FORMAT = 2
+
+IngestType = TypeVar('IngestType', bound=type[Ingest])
+
+
+def cache_folder() -> Path:
+    """Folder parsed documents are cached in. This is :code:`$PALGEN_CACHE_DIR` if set,
+    otherwise :code:`palgen/ingest` in the user's cache folder.
+
+    Returns:
+        Path: Cache folder
+    """
+    if folder := os.environ.get('PALGEN_CACHE_DIR'):
+        return Path(folder)
+
+    root = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(root) / 'palgen' / 'ingest'
+
+
+def cached(cls: IngestType) -> IngestType:
+    """Caches the parsed results of an ingest class on disk, across palgen runs and extensions.
+
+    Entries are keyed by the ingest class, its options and the file's path. They are reused
+    if the file's size and modification time or, failing that, its content hash are unchanged.
+    Results must be picklable, otherwise they are not cached.
+
+    Example:
+
+    .. code-block:: python
+
+        @cached
+        class Descriptors(Json):
+            __slots__ = ()
+
+    Args:
+        cls (type[Ingest]): Ingest class implementing :code:`load`
+
+    Returns:
+        type[Ingest]: The same class, loading through the cache
+    """
+    load: Callable[[Ingest, Path], Iterable[tuple[Path, Any]]] = cls.load
+
+    @functools.wraps(load)
+    def cached_load(self: Ingest, file: Path) -> Iterable[tuple[Path, Any]]:
+        if not isinstance(file, Path) or (isinstance(file, VirtualPath) and file.is_virtual):
+            yield from load(self, file)
+            return
+
+        yield from _Entry(self, file).load(lambda: list(load(self, file)))
+
+    cls.load = cached_load  # type: ignore[method-assign]
+    return cls
+
+
+class _Entry:
+    __slots__ = 'file', 'path', 'stat'
+
+    def __init__(self, ingest: Ingest, file: Path) -> None:
+        self.file = file
+        self.stat = file.stat()
+
+        key = repr((FORMAT, type(ingest).__module__, type(ingest).__qualname__,
+                    options_of(ingest), str(file.resolve())))
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        self.path = cache_folder() / digest[:2] / digest[2:]
+
+    def load(self, parse: Callable[[], list[tuple[Path, Any]]]) -> list[tuple[Path, Any]]:
+        content_hash: Optional[bytes] = None
+        stored = self._read()
+
+        if stored is not None:
+            size, mtime_ns, stored_hash, contents = stored
+            if (size, mtime_ns) == (self.stat.st_size, self.stat.st_mtime_ns):
+                return [(self.file, content) for content in contents]
+
+            content_hash = self._hash()
+            if content_hash == stored_hash:
+                # ie. touched or checked out again
+                self._write(content_hash, contents)
+                return [(self.file, content) for content in contents]
+
+        results = parse()
+        self._write(content_hash or self._hash(), [content for _, content in results])
+        return results
+
+    def _hash(self) -> bytes:
+        digest = hashlib.blake2b()
+        with open(self.file, 'rb') as stream:
+            while chunk := stream.read(1 << 20):
+                digest.update(chunk)
+        return digest.digest()
+
+    def _read(self) -> Optional[tuple[int, int, bytes, list[Any]]]:
+        try:
+            with open(self.path, 'rb') as stream:
+                entry: tuple[int, int, bytes, list[Any]] = pickle.load(stream)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            _logger.debug("Discarding cache entry %s: %s", self.path, exc)
+            return None
+        return entry
+
+    def _write(self, content_hash: bytes, contents: list[Any]) -> None:
+        try:
+            data = pickle.dumps((self.stat.st_size, self.stat.st_mtime_ns, content_hash, contents),
+                                protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            _logger.debug("Not caching %s: %s", self.file, exc)
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # write atomically, other workers might read this entry at the same time
+            with tempfile.NamedTemporaryFile(dir=self.path.parent, delete=False) as stream:
+                stream.write(data)
+            os.replace(stream.name, self.path)
+        except OSError as exc:
+            _logger.debug("Could not write cache entry %s: %s", self.path, exc)
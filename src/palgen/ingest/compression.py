@@ -0,0 +1,92 @@
+import bz2
+import gzip
+import io
+import lzma
+from pathlib import Path, PurePath
+from typing import IO, Callable, Optional, cast
+
+from ..machinery.virtual import VirtualPath
+
+# trailing suffixes of compressed files and how to open them
+COMPRESSION: dict[str, Callable[..., IO[bytes]]] = {
+    # accepts both paths and streams, GzipFile is not typed as IO[bytes]
+    '.gz':   lambda source: cast(IO[bytes], gzip.open(source)),
+    '.bz2':  bz2.BZ2File,
+    '.xz':   lzma.LZMAFile,
+    '.lzma': lzma.LZMAFile,
+}
+
+
+def compression_of(path: PurePath) -> Optional[str]:
+    """
+    Args:
+        path (PurePath): path to check
+
+    Returns:
+        Optional[str]: Compression suffix of the path, ie `.gz` for `foo.json.gz`, or None if it is not compressed
+    """
+    return path.suffix if path.suffix in COMPRESSION else None
+
+
+def strip_compression(suffixes: list[str]) -> list[str]:
+    """Drops a trailing compression suffix.
+
+    Args:
+        suffixes (list[str]): all suffixes of a path, ie `['.json', '.gz']`
+
+    Returns:
+        list[str]: suffixes of the decompressed file, ie `['.json']`
+    """
+    return suffixes[:-1] if suffixes and suffixes[-1] in COMPRESSION else suffixes
+
+
+def open_binary(file: Path) -> IO[bytes]:
+    """Opens a file for reading. Compressed files are decompressed on the fly.
+
+    Args:
+        file (Path): file to open
+
+    Returns:
+        IO[bytes]: stream of the (decompressed) content
+    """
+    suffix = compression_of(file)
+    if isinstance(file, VirtualPath) and file.is_virtual:
+        # virtual paths stream their content themselves, ie. out of an archive
+        stream: IO[bytes] = file.open('rb')
+        return stream if suffix is None else COMPRESSION[suffix](stream)
+
+    return open(file, 'rb') if suffix is None else COMPRESSION[suffix](file)
+
+
+def read_bytes(file: Path) -> bytes:
+    """Reads a file, decompressing it if its trailing suffix says it is compressed.
+
+    Args:
+        file (Path): file to read
+
+    Returns:
+        bytes: (decompressed) content
+    """
+    if compression_of(file) is None:
+        return file.read_bytes()
+
+    with open_binary(file) as stream:
+        return stream.read()
+
+
+def read_text(file: Path, encoding: str = 'utf-8') -> str:
+    """Reads a file as text, decompressing it if its trailing suffix says it is compressed.
+    Line endings are translated like :code:`Path.read_text` does.
+
+    Args:
+        file (Path): file to read
+        encoding (str, optional): Encoding of the (decompressed) content. Defaults to 'utf-8'.
+
+    Returns:
+        str: (decompressed) content
+    """
+    if compression_of(file) is None:
+        return file.read_text(encoding)
+
+    with io.TextIOWrapper(open_binary(file), encoding) as stream:
+        return stream.read()
@@ -0,0 +1,146 @@
+import logging
+import mmap
+import re
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from ..machinery.virtual import VirtualPath
+from .filter import _combine
+
+_logger = logging.getLogger(__name__)
+
+# smaller files are read at once, mapping them costs more than reading
+MMAP_THRESHOLD = 1 << 16
+
+_Buffer = bytes | mmap.mmap
+
+
+def scan(file: Path, check: Callable[[_Buffer], bool], limit: Optional[int] = None) -> bool:
+    """Runs :code:`check` on the content of a file without reading more than necessary.
+    Large files are memory mapped, so only the pages :code:`check` touches are loaded.
+
+    Args:
+        file (Path): File to check
+        check (Callable[[bytes | mmap.mmap], bool]): Check to run on the file's content
+        limit (Optional[int], optional): Only check the first `limit` bytes. Defaults to None.
+
+    Returns:
+        bool: Result of :code:`check`
+    """
+    if isinstance(file, VirtualPath) and file.is_virtual:
+        content = file.read_bytes()
+        return check(content if limit is None else content[:limit])
+
+    with open(file, 'rb') as stream:
+        if limit is not None and limit <= MMAP_THRESHOLD:
+            return check(stream.read(limit))
+
+        size = stream.seek(0, 2)
+        if size <= MMAP_THRESHOLD:
+            # empty files cannot be mapped
+            stream.seek(0)
+            return check(stream.read(limit))
+
+        with mmap.mmap(stream.fileno(), 0 if limit is None else min(limit, size), access=mmap.ACCESS_READ) as view:
+            return check(view)
+
+
+class Content:
+    """Filters files by their content. Files that cannot be read are skipped."""
+
+    __slots__ = ('limit',)
+
+    def __init__(self, limit: Optional[int] = None) -> None:
+        """
+        Args:
+            limit (Optional[int], optional): Only check the first `limit` bytes of every file.
+                                             Defaults to None, which checks the entire file.
+        """
+        self.limit = limit
+
+    def check(self, content: _Buffer) -> bool:
+        raise NotImplementedError
+
+    def filter(self, files: Iterable[Path]) -> Iterable[Path]:
+        """
+        Args:
+            files (Iterable[Path]): input Iterable of files to filter
+
+        Yields:
+            Path: for every file whose content matches
+        """
+        for file in files:
+            try:
+                if scan(file, self.check, self.limit):
+                    yield file
+            except OSError as exc:
+                _logger.warning("Could not read %s: %s", file, exc)
+
+    def __call__(self, files: Iterable[Path]) -> Iterable[Path]:
+        yield from self.filter(files)
+
+
+class Contains(Content):
+    __slots__ = ('needles', 'pattern')
+
+    def __init__(self, *needles: bytes, limit: Optional[int] = None) -> None:
+        """Keeps files containing any of the needles. All needles are searched in a single pass.
+
+        Args:
+            *needles (bytes): byte strings to search for
+            limit (Optional[int], optional): Only search the first `limit` bytes. Defaults to None.
+        """
+        super().__init__(limit)
+        self.needles = needles
+        self.pattern = re.compile(b'|'.join(re.escape(needle) for needle in needles)) if len(needles) > 1 else None
+
+    def check(self, content: _Buffer) -> bool:
+        if self.pattern is None:
+            return bool(self.needles) and content.find(self.needles[0]) != -1
+        return self.pattern.search(content) is not None
+
+    def __repr__(self) -> str:
+        return f"Contains({', '.join(repr(needle) for needle in self.needles)})"
+
+
+class Matches(Content):
+    __slots__ = ('patterns',)
+
+    def __init__(self, *patterns: bytes | re.Pattern[bytes], limit: Optional[int] = None) -> None:
+        """Keeps files in which any of the regex patterns can be found.
+        If possible, all patterns are combined into one and searched in a single pass.
+
+        Args:
+            *patterns (bytes | re.Pattern[bytes]): regex patterns to search for
+            limit (Optional[int], optional): Only search the first `limit` bytes. Defaults to None.
+        """
+        super().__init__(limit)
+        self.patterns = _combine([re.compile(pattern) for pattern in patterns])
+
+    def check(self, content: _Buffer) -> bool:
+        return any(pattern.search(content) is not None for pattern in self.patterns)
+
+    def __repr__(self) -> str:
+        return f"Matches({', '.join(repr(pattern.pattern) for pattern in self.patterns)})"
+
+
+class Magic(Content):
+    __slots__ = ('signatures', 'offset')
+
+    def __init__(self, *signatures: bytes, offset: int = 0) -> None:
+        """Keeps files starting with any of the signatures at `offset`. Only reads as much as needed.
+
+        Args:
+            *signatures (bytes): magic numbers to check for
+            offset (int, optional): Position of the magic number in the file. Defaults to 0.
+        """
+        super().__init__(offset + max((len(signature) for signature in signatures), default=0))
+        self.signatures = signatures
+        self.offset = offset
+
+    def check(self, content: _Buffer) -> bool:
+        return any(content[self.offset:self.offset + len(signature)] == signature
+                   for signature in self.signatures)
+
+    def __repr__(self) -> str:
+        return f"Magic({', '.join(repr(signature) for signature in self.signatures)}, offset={self.offset})"
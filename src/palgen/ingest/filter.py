@@ -2,12 +2,68 @@
 
 import fnmatch
 import re
+from functools import cached_property
 from pathlib import Path, PurePath
-from typing import Any, Iterable, Optional
+from typing import Any, AnyStr, Iterable, Optional
+
+from ..machinery.index import Files
+from .compression import COMPRESSION, strip_compression
+
+# backreferences are ambiguous once patterns are combined
+_BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+
+
+class PathInfo:
+    def __init__(self, path: PurePath) -> None:
+        """View of a path whose attributes are computed on first access only.
+        Filters evaluated against the same view share those attributes.
+
+        Args:
+            path (PurePath): path to describe
+        """
+        self.path = path
+
+    @cached_property
+    def text(self) -> str:
+        return str(self.path)
+
+    @cached_property
+    def parts(self) -> tuple[str, ...]:
+        return self.path.parts
+
+    @cached_property
+    def name(self) -> str:
+        return self.path.name
+
+    @cached_property
+    def stem(self) -> str:
+        return self.path.stem
+
+    @cached_property
+    def suffixes(self) -> list[str]:
+        return self.path.suffixes
+
+    @cached_property
+    def suffix(self) -> str:
+        """All suffixes concatenated, ie `.tar.gz` for `foo.tar.gz`"""
+        return ''.join(self.suffixes)
+
+    @cached_property
+    def plain_suffixes(self) -> list[str]:
+        """Suffixes without a trailing compression suffix, ie `['.json']` for `foo.json.gz`"""
+        return strip_compression(self.suffixes)
+
+    @cached_property
+    def plain_suffix(self) -> str:
+        """Suffixes of the decompressed file concatenated, ie `.json` for `foo.json.gz`"""
+        return ''.join(self.plain_suffixes)
 
 
 class Filter:
-    __slots__ = ('needles',)
+    __slots__ = ('needles', 'exact', 'patterns')
+
+    # attribute of the path this filter checks, if it can be looked up in a file index
+    index_key: Optional[str] = None
 
     def __init__(self, *needles: str | re.Pattern[str], regex: bool = False, unix: bool = False) -> None:
         """ Generic filter
@@ -19,6 +75,10 @@ class Filter:
 
         Important:
             Needles that start with `^` or end with `$` are always converted to regex patterns.
+
+        Note:
+            All needles are compiled into a set of exact strings and, if possible, a single
+            alternation of all patterns. Matching a string therefore costs one hash lookup and one regex match.
         """
         self.needles: list[str | re.Pattern[str]] = []
 
@@ -36,7 +96,12 @@ class Filter:
             else:
                 self.needles.append(needle)
 
-    def match_str(self, other: str):
+        self.exact: frozenset[str] = frozenset(needle for needle in self.needles
+                                               if isinstance(needle, str))
+        self.patterns: tuple[re.Pattern[str], ...] = _combine([needle for needle in self.needles
+                                                               if isinstance(needle, re.Pattern)])
+
+    def match_str(self, other: str) -> bool:
         """
         Args:
             other: string to check against
@@ -44,10 +109,20 @@ class Filter:
         Returns:
             True if `other` matches any of the needles
         """
-        return any(re.match(needle, other)
-                   if isinstance(needle, re.Pattern)
-                   else needle == other
-                   for needle in self.needles)
+        return other in self.exact or any(pattern.match(other) for pattern in self.patterns)
+
+    def match_any(self, others: Iterable[str]) -> bool:
+        """
+        Args:
+            others: strings to check against
+
+        Returns:
+            True if any of `others` matches any of the needles
+        """
+        if not self.patterns:
+            return not self.exact.isdisjoint(others)
+
+        return any(self.match_str(other) for other in others)
 
     def match_files(self, files: Iterable[Path], attribute=None):
         """
@@ -65,15 +140,90 @@ class Filter:
                               else getattr(file, attribute)):
                 yield file
 
+    def matches(self, file: PurePath | PathInfo) -> bool:
+        """
+        Args:
+            file: path to check
+
+        Returns:
+            True if the path passes this filter
+        """
+        return self.test(file if isinstance(file, PathInfo) else PathInfo(file))
+
+    def test(self, path: PathInfo) -> bool:
+        """
+        Args:
+            path: view of the path to check
+
+        Returns:
+            True if the full path matches any of the needles
+        """
+        return self.match_str(path.text)
+
     def filter(self, files: Iterable[Path]) -> Iterable[Path]:
         """
         Args:
             files: input Iterable of files to filter
 
         Yields:
-            Path: for every file that matches any of the needles
+            Path: for every file that matches
+        """
+        for file in files:
+            assert isinstance(file, (Path, PurePath)), f"File isn't a Path object: {file}"
+            if self.test(PathInfo(file)):
+                yield file
+
+    @property
+    def name_only(self) -> bool:
+        """Whether this filter only checks the file name, which does not change when rebasing paths."""
+        return False
+
+    @property
+    def selectable(self) -> bool:
+        """Whether :code:`matches` agrees with running this filter as a step. Only then it may be evaluated
+        for single paths, ie. to pre-select files, and be moved or fused with other filters.
+        Subclasses overriding :code:`filter` or :code:`__call__` instead of :code:`test` are run as steps only.
         """
-        yield from self.match_files(files)
+        cls = type(self)
+        return cls.filter is Filter.filter and cls.__call__ is Filter.__call__
+
+    def candidates(self, files: Files) -> Optional[set[int]]:
+        """Looks up the files this filter matches in the indexes of `files`.
+        Patterns are only checked once for every distinct value of the attribute.
+
+        Args:
+            files: indexed list of files
+
+        Returns:
+            Positions of exactly the files that pass this filter or None if this filter cannot use the index
+        """
+        if self.index_key is None:
+            return None
+
+        if not self.patterns:
+            return files.lookup(self.index_key, self.exact)
+        return files.select(self.index_key, self.match_str)
+
+    def __and__(self, other: object) -> 'Filter':
+        if not isinstance(other, Filter):
+            return NotImplemented
+        return And(self, other)
+
+    def __or__(self, other: object) -> 'Filter':
+        if not isinstance(other, Filter):
+            return NotImplemented
+        return Or(self, other)
+
+    def __invert__(self) -> 'Filter':
+        return Not(self)
+
+    def __repr__(self) -> str:
+        needles = ', '.join(repr(needle if isinstance(needle, str) else needle.pattern)
+                            for needle in self.needles)
+        return f"{type(self).__name__}({needles})"
+
+    def __str__(self) -> str:
+        return repr(self)
 
     def __call__(self, file_cache: Iterable[Path]) -> Iterable[Path]:
         """
@@ -101,25 +251,56 @@ class Pattern(Filter):
 
 class Folder(Filter):
     __slots__ = ()
+    index_key = 'part'
 
-    def filter(self, files: Iterable[Path]) -> Iterable[Path]:
+    def test(self, path: PathInfo) -> bool:
         """Filters by folder name. This will match folder names at any level
 
         Args:
-            files (Iterable[Path]): input Iterable of files to filter
+            path (PathInfo): view of the path to check
 
-        Yields:
-            Path: for every file that matches any of the needles
+        Returns:
+            bool: True if any part of the path matches any of the needles
         """
-        for file in files:
-            if any(self.match_str(part) for part in file.parts):
-                yield file
+        return self.match_any(path.parts)
 
 
 class Suffix(Filter):
-    __slots__ = ()
+    __slots__ = ('compressed',)
+    index_key = 'suffix'
 
-    def filter(self, files: Iterable[Path]) -> Iterable[Path]:
+    def __init__(self, *needles: str | re.Pattern[str], regex: bool = False,
+                 unix: bool = False, compressed: bool = False) -> None:
+        """ Suffix filter
+
+        Args:
+            *needles (str | re.Pattern[str]): list of strings or regex patterns
+            regex (bool): if True, all needles will be interpreted as regex patterns
+            unix (bool): if True, all needles will be interpreted as unix patterns
+            compressed (bool): if True, a trailing compression suffix (`.gz`, `.bz2`, `.xz` or `.lzma`)
+                               is ignored, ie `.json` also matches `foo.json.gz`
+        """
+        self.compressed = compressed
+        super().__init__(*needles, regex=regex, unix=unix)
+
+    def candidates(self, files: Files) -> Optional[set[int]]:
+        if not self.compressed:
+            return super().candidates(files)
+
+        if not self.patterns:
+            return files.lookup(self.index_key, {needle + compression
+                                                 for needle in self.exact
+                                                 for compression in ('', *COMPRESSION)})
+        return files.select(self.index_key, self._match_plain)
+
+    def _match_plain(self, suffix: str) -> bool:
+        return self.match_str(''.join(strip_compression(PurePath(f'_{suffix}').suffixes)))
+
+    @property
+    def name_only(self) -> bool:
+        return True
+
+    def test(self, path: PathInfo) -> bool:
         """Filters by suffix with leading dot. Unlike Python's default behavior this
         concatenates all suffixes.
 
@@ -127,23 +308,19 @@ class Suffix(Filter):
         this will instead check against `.tar.gz`.
 
         Args:
-            files (Iterable[Path]): input Iterable of files to filter
+            path (PathInfo): view of the path to check
 
-        Yields:
-            Path: for every file that matches any of the needles
+        Returns:
+            bool: True if the concatenated suffixes match any of the needles
         """
-        for file in files:
-            suffix = ''.join(file.suffixes)
-
-            if self.match_str(suffix):
-                yield file
+        return self.match_str(path.plain_suffix if self.compressed else path.suffix)
 
 
 class Suffixes(Filter):
-    __slots__ = ('position',)
+    __slots__ = ('position', 'compressed')
 
     def __init__(self, *needles: str | re.Pattern[str], regex: bool = False,
-                 unix: bool = False, position: Optional[int] = None) -> None:
+                 unix: bool = False, position: Optional[int] = None, compressed: bool = False) -> None:
         """ Multiple suffixes filter
 
         Args:
@@ -152,60 +329,242 @@ class Suffixes(Filter):
             unix (bool): if True, all needles will be interpreted as unix patterns
             position (Optional[int]): Check against the suffix at position `position` only.
                                       Tries all parts of the suffix if this is `None`.
+            compressed (bool): if True, a trailing compression suffix (`.gz`, `.bz2`, `.xz` or `.lzma`)
+                               is ignored and positions refer to the suffixes of the decompressed file
         """
         self.position = position
+        self.compressed = compressed
         super().__init__(*needles, regex=regex, unix=unix)
 
-    def filter(self, files: Iterable[Path]) -> Iterable[Path]:
+    @property
+    def name_only(self) -> bool:
+        return True
+
+    def test(self, path: PathInfo) -> bool:
         """Filters by suffix
 
         Args:
-            files (Iterable[Path]): input Iterable of files to filter
+            path (PathInfo): view of the path to check
 
-        Yields:
-            Path: for every file that matches any of the needles
+        Returns:
+            bool: True if any suffix (or the one at `position`) matches any of the needles
         """
-        for file in files:
-            if self.position is None:
-                if any(self.match_str(part) for part in file.suffixes):
-                    yield file
-            else:
-                if len(file.suffixes) < self.position + 1:
-                    continue
+        suffixes = path.plain_suffixes if self.compressed else path.suffixes
+        if self.position is None:
+            return self.match_any(suffixes)
 
-                if self.match_str(file.suffixes[self.position]):
-                    yield file
+        if not -len(suffixes) <= self.position < len(suffixes):
+            return False
+
+        return self.match_str(suffixes[self.position])
 
 
 class Stem(Filter):
     __slots__ = ()
+    index_key = 'stem'
 
-    def filter(self, files: Iterable[Path]) -> Iterable[Path]:
-        """Filters by stem (file's name without extension(s))
-        ie the stem of `foobar.tar.gz` is `foobar`
+    @property
+    def name_only(self) -> bool:
+        return True
+
+    def test(self, path: PathInfo) -> bool:
+        """Filters by stem (file's name without its last extension)
+        ie the stem of `foobar.tar.gz` is `foobar.tar`
 
         Args:
-            files (Iterable[Path]): input Iterable of files to filter
+            path (PathInfo): view of the path to check
 
-        Yields:
-            Path: for every file that matches any of the needles
+        Returns:
+            bool: True if the stem matches any of the needles
         """
-        yield from self.match_files(files, 'stem')
+        return self.match_str(path.stem)
 
 
 class Name(Filter):
     __slots__ = ()
+    index_key = 'name'
 
-    def filter(self, files: Iterable[Path]) -> Iterable[Path]:
+    @property
+    def name_only(self) -> bool:
+        return True
+
+    def test(self, path: PathInfo) -> bool:
         """Filters by name
 
         Args:
-            files (Iterable[Path]): input Iterable of files to filter
+            path (PathInfo): view of the path to check
 
-        Yields:
-            Path: for every file that matches any of the needles
+        Returns:
+            bool: True if the name matches any of the needles
         """
-        yield from self.match_files(files, 'name')
+        return self.match_str(path.name)
+
+
+class And(Filter):
+    __slots__ = ('operands',)
+
+    def __init__(self, *operands: Filter) -> None:
+        """Matches paths that pass all of the given filters. Usually created through `a & b`.
+
+        Args:
+            *operands (Filter): filters to combine
+        """
+        super().__init__()
+        self.operands: tuple[Filter, ...] = tuple(nested
+                                                  for operand in operands
+                                                  for nested in (operand.operands
+                                                                 if isinstance(operand, And)
+                                                                 else (operand,)))
+
+    def test(self, path: PathInfo) -> bool:
+        return all(operand.test(path) for operand in self.operands)
+
+    def filter(self, files: Iterable[Path]) -> Iterable[Path]:
+        if self.selectable:
+            yield from super().filter(files)
+            return
+
+        # some operands only work as steps
+        for operand in self.operands:
+            files = operand(files)
+        yield from files
+
+    @property
+    def selectable(self) -> bool:
+        return all(operand.selectable for operand in self.operands)
+
+    def candidates(self, files: Files) -> Optional[set[int]]:
+        found: list[set[int]] = []
+        for operand in self.operands:
+            if (candidates := operand.candidates(files)) is None:
+                return None
+            found.append(candidates)
+        return set.intersection(*found)
+
+    @property
+    def name_only(self) -> bool:
+        return all(operand.name_only for operand in self.operands)
+
+    def __repr__(self) -> str:
+        return ' & '.join(f"({operand})" if isinstance(operand, Or) else str(operand)
+                          for operand in self.operands)
+
+
+class Or(Filter):
+    __slots__ = ('operands',)
+
+    def __init__(self, *operands: Filter) -> None:
+        """Matches paths that pass any of the given filters. Usually created through `a | b`.
+
+        Args:
+            *operands (Filter): filters to combine
+        """
+        super().__init__()
+        self.operands: tuple[Filter, ...] = tuple(nested
+                                                  for operand in operands
+                                                  for nested in (operand.operands
+                                                                 if isinstance(operand, Or)
+                                                                 else (operand,)))
+
+    def test(self, path: PathInfo) -> bool:
+        return any(operand.test(path) for operand in self.operands)
+
+    def filter(self, files: Iterable[Path]) -> Iterable[Path]:
+        if self.selectable:
+            yield from super().filter(files)
+            return
+
+        # some operands only work as steps
+        files = list(files)
+        passed: set[Path] = set()
+        for operand in self.operands:
+            passed.update(operand(files))
+        yield from (file for file in files if file in passed)
+
+    @property
+    def selectable(self) -> bool:
+        return all(operand.selectable for operand in self.operands)
+
+    def candidates(self, files: Files) -> Optional[set[int]]:
+        found: set[int] = set()
+        for operand in self.operands:
+            if (candidates := operand.candidates(files)) is None:
+                return None
+            found |= candidates
+        return found
+
+    @property
+    def name_only(self) -> bool:
+        return all(operand.name_only for operand in self.operands)
+
+    def __repr__(self) -> str:
+        return ' | '.join(str(operand) for operand in self.operands)
+
+
+class Not(Filter):
+    __slots__ = ('operand',)
+
+    def __init__(self, operand: Filter) -> None:
+        """Matches paths that do not pass the given filter. Usually created through `~a`.
+
+        Args:
+            operand (Filter): filter to invert
+        """
+        super().__init__()
+        self.operand = operand
+
+    def test(self, path: PathInfo) -> bool:
+        return not self.operand.test(path)
+
+    def filter(self, files: Iterable[Path]) -> Iterable[Path]:
+        if self.selectable:
+            yield from super().filter(files)
+            return
+
+        # the operand only works as a step
+        files = list(files)
+        excluded = set(self.operand(files))
+        yield from (file for file in files if file not in excluded)
+
+    @property
+    def selectable(self) -> bool:
+        return self.operand.selectable
+
+    def candidates(self, files: Files) -> Optional[set[int]]:
+        if (candidates := self.operand.candidates(files)) is None:
+            return None
+        return set(range(len(files))) - candidates
+
+    def __invert__(self) -> Filter:
+        return self.operand
+
+    @property
+    def name_only(self) -> bool:
+        return self.operand.name_only
+
+    def __repr__(self) -> str:
+        return f"~({self.operand})" if isinstance(self.operand, (And, Or)) else f"~{self.operand}"
+
+
+def _combine(patterns: list[re.Pattern[AnyStr]]) -> tuple[re.Pattern[AnyStr], ...]:
+    """Combines patterns into a single alternation. Falls back to the individual patterns
+    if they use different flags, contain backreferences or their groups clash."""
+    if len(patterns) < 2:
+        return tuple(patterns)
+
+    # latin-1 maps every byte to one character, so byte patterns survive the round trip
+    sources = [pattern.pattern if isinstance(pattern.pattern, str) else pattern.pattern.decode('latin-1')
+               for pattern in patterns]
+    flags = {pattern.flags for pattern in patterns}
+    if len(flags) != 1 or any(_BACKREFERENCE.search(source) for source in sources):
+        return tuple(patterns)
+
+    combined = '|'.join(f'(?:{source})' for source in sources)
+    try:
+        return (re.compile(combined if isinstance(patterns[0].pattern, str) else combined.encode('latin-1'),
+                           flags.pop()),)
+    except re.error:
+        return tuple(patterns)
 
 
 def Passthrough(data: Iterable[Any]) -> Iterable[Any]:
@@ -0,0 +1,127 @@
+import codecs
+import logging
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .compression import open_binary
+from .loader import Ingest
+
+_logger = logging.getLogger(__name__)
+
+# front matter blocks longer than this are not searched for their closing delimiter
+FRONT_MATTER_LIMIT = 1 << 16
+
+
+class Head(Ingest):
+    __slots__ = ('n_bytes', 'n_lines', 'encoding')
+    immutable = True
+
+    def __init__(self, n_bytes: Optional[int] = None, n_lines: Optional[int] = None,
+                 encoding: Optional[str] = 'utf-8', prefetch: int = 0) -> None:
+        """Ingests the beginning of every file only, ie. to check license headers or magic comments.
+        Files are read through a buffer which stops right after the requested prefix.
+
+        Args:
+            n_bytes (Optional[int], optional): Read at most this many bytes. Defaults to None.
+            n_lines (Optional[int], optional): Read at most this many lines, including their line endings.
+                                               Defaults to None.
+            encoding (Optional[str], optional): Encoding to decode the prefix with. A character cut off
+                by `n_bytes` is dropped. Use None to yield bytes. Defaults to 'utf-8'.
+            prefetch (int, optional): Amount of files to read ahead. Defaults to 0.
+
+        Raises:
+            ValueError: Neither `n_bytes` nor `n_lines` is given.
+        """
+        if n_bytes is None and n_lines is None:
+            raise ValueError("Head requires n_bytes or n_lines")
+
+        super().__init__(prefetch)
+        self.n_bytes = n_bytes
+        self.n_lines = n_lines
+        self.encoding = encoding
+
+    def load(self, file: Path) -> Iterable[tuple[Path, str | bytes]]:
+        """Loads the beginning of a file.
+
+        Args:
+            file (Path): Path to the file that should be loaded.
+
+        Yields:
+            tuple[Path, str | bytes]: Tuple of the path and the file's first bytes or lines.
+        """
+        with open_binary(file) as stream:
+            if self.n_lines is None:
+                prefix = stream.read(-1 if self.n_bytes is None else self.n_bytes)
+            else:
+                prefix = b''.join(_head_lines(stream, self.n_lines, self.n_bytes))
+
+        if self.encoding is None:
+            yield file, prefix
+        else:
+            # not final, incomplete trailing characters are dropped
+            yield file, codecs.getincrementaldecoder(self.encoding)().decode(prefix)
+
+
+class FrontMatter(Ingest):
+    __slots__ = ('delimiter', 'encoding', 'limit')
+    immutable = True
+
+    def __init__(self, delimiter: str = '---', encoding: str = 'utf-8',
+                 limit: int = FRONT_MATTER_LIMIT, prefetch: int = 0) -> None:
+        """Ingests the front matter block of every file, ie. the TOML between two `+++` lines
+        at the top of a Markdown file. Reading stops at the closing delimiter.
+        Files not starting with the delimiter are skipped.
+
+        Args:
+            delimiter (str, optional): Line opening and closing the block. Defaults to '---'.
+            encoding (str, optional): Encoding to use when reading files. Defaults to 'utf-8'.
+            limit (int, optional): Maximum size of the block in bytes. Files whose block is not closed
+                                   within this limit are skipped with a warning. Defaults to 64 KiB.
+            prefetch (int, optional): Amount of files to read ahead. Defaults to 0.
+        """
+        super().__init__(prefetch)
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self.limit = limit
+
+    def load(self, file: Path) -> Iterable[tuple[Path, str]]:
+        """Loads the front matter of a file.
+
+        Args:
+            file (Path): Path to the file that should be loaded.
+
+        Yields:
+            tuple[Path, str]: Tuple of the path and the content of the block, without its delimiters.
+        """
+        delimiter = self.delimiter.encode(self.encoding)
+        lines: list[bytes] = []
+
+        with open_binary(file) as stream:
+            first = stream.readline(len(delimiter) + 3)
+            if first.rstrip(b'\r\n') != delimiter or not first.endswith(b'\n'):
+                return
+
+            size = 0
+            while line := stream.readline(self.limit - size + 1):
+                if line.rstrip(b'\r\n') == delimiter:
+                    yield file, b''.join(lines).decode(self.encoding)
+                    return
+
+                size += len(line)
+                if size > self.limit:
+                    break
+
+                lines.append(line)
+
+        _logger.warning("%s: front matter is not closed within %d bytes", file, self.limit)
+
+
+def _head_lines(stream, n_lines: int, n_bytes: Optional[int]) -> Iterable[bytes]:
+    remaining = -1 if n_bytes is None else n_bytes
+    for _ in range(n_lines):
+        if remaining == 0 or not (line := stream.readline(remaining)):
+            return
+
+        if remaining > 0:
+            remaining -= len(line)
+        yield line
@@ -1,7 +1,20 @@
 import logging
+import mmap as _mmap
+import os
 from abc import abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from ..machinery.formats import TomlError, loads_json, loads_toml
+from ..machinery.virtual import VirtualPath
+from . import content
+from .compression import compression_of, read_bytes, read_text
+from .memo import current_memo
 
 _logger = logging.getLogger(__name__)
 
@@ -10,23 +23,66 @@ class Ingest:
     """Ingest interface.
     """
 
-    __slots__ = ()
+    __slots__ = ('prefetch',)
+
+    # results may be kept in the per-run ingest memo, see :code:`palgen.ingest.memo`
+    memoize: bool = True
+    # results cannot be modified in place and may be handed to several readers as they are
+    immutable: bool = False
+
+    def __init__(self, prefetch: int = 0) -> None:
+        """
+        Args:
+            prefetch (int, optional): Amount of files to read ahead on background threads while
+                                      downstream steps process the current one. Defaults to 0.
+        """
+        self.prefetch = prefetch
 
     @abstractmethod
-    def ingest(self, files: Iterable[Path]) -> Iterable[tuple[Path, Any]]:
-        """Ingests files.
+    def load(self, file: Path) -> Iterable[tuple[Path, Any]]:
+        """Loads a single file.
 
         Args:
-            files (Iterable[Path]):  An iterable of Paths that should be ingested.
+            file (Path): Path to the file that should be loaded.
 
         Yields:
-            tuple[Path, Any]: Tuple of a path to every ingested file and its content.
+            tuple[Path, Any]: Tuple of the path and the file's content, if it could be loaded.
         """
         raise NotImplementedError
 
         # sourcery skip: remove-unreachable-code; pylint: disable=unreachable
         yield  # type: ignore [unreachable]
 
+    def ingest(self, files: Iterable[Path]) -> Iterable[tuple[Path, Any]]:
+        """Ingests files. Results are yielded in input order, even if files are read ahead.
+
+        Args:
+            files (Iterable[Path]):  An iterable of Paths that should be ingested.
+
+        Yields:
+            tuple[Path, Any]: Tuple of a path to every ingested file and its content.
+        """
+        memo = current_memo() if self.memoize else None
+        load = self.load if memo is None else partial(memo.load, self)
+
+        if self.prefetch <= 0:
+            for file in files:
+                yield from load(file)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=self.prefetch, thread_name_prefix='palgen-prefetch')
+        pending: deque[Future[list[tuple[Path, Any]]]] = deque()
+        try:
+            for file in files:
+                pending.append(executor.submit(_load_all, load, file))
+                if len(pending) > self.prefetch:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
     def __call__(self, files: Iterable[Path]) -> Iterable[tuple[Path, Any]]:
         yield from self.ingest(files)
 
@@ -34,100 +90,177 @@ class Ingest:
 class Empty(Ingest):
     __slots__ = ()
 
-    def ingest(self, files: Iterable[Path]) -> Iterable[tuple[Path, None]]:
-        """Ingests files if they are empty. Warns if a file in the :code:`files` iterable
-        is not empty.
+    def load(self, file: Path) -> Iterable[tuple[Path, None]]:
+        """Loads a file if it is empty. Warns if the file is not empty.
 
         Args:
-            files (Iterable[Path]):  An iterable of Paths that should be ingested.
+            file (Path): Path to the file that should be loaded.
 
         Yields:
-            tuple[Path, None]: Tuple of a path to every ingested file and None.
+            tuple[Path, None]: Tuple of the path and None.
         """
-        for file in files:
-            if not file.exists():
-                continue
+        if not file.exists():
+            return
 
-            if file.stat().st_size == 0:
-                yield file, None
-            else:
-                _logger.warning("%s matches ingest configuration but is not empty.",
-                                file)
+        if file.stat().st_size == 0:
+            yield file, None
+        else:
+            _logger.warning("%s matches ingest configuration but is not empty.",
+                            file)
 
 
 class Raw(Ingest):
-    __slots__ = ()
+    __slots__ = ('mmap',)
+    immutable = True
 
-    def ingest(self, files: Iterable[Path]) -> Iterable[tuple[Path, bytes]]:
-        """Ingests files as raw bytes.
+    def __init__(self, mmap: bool = False, prefetch: int = 0) -> None:
+        """Raw ingest.
 
         Args:
-            files (Iterable[Path]):  An iterable of Paths that should be ingested.
+            mmap (bool, optional): Yield read-only memoryviews of memory mapped files instead of copying
+                                   their content. Small and compressed files are read regardless.
+                                   Defaults to False.
+            prefetch (int, optional): Amount of files to read ahead. Defaults to 0.
+
+        Note:
+            Memoryviews cannot be pickled. Convert them before they leave the task, ie. when the next step
+            runs with a different amount of jobs.
+        """
+        super().__init__(prefetch)
+        self.mmap = mmap
+
+    @property
+    def memoize(self) -> bool:  # type: ignore[override]
+        # mappings are released once the next file is loaded
+        return not self.mmap
+
+    def load(self, file: Path) -> Iterable[tuple[Path, bytes | memoryview]]:
+        """Loads a file as raw bytes.
+
+        Args:
+            file (Path): Path to the file that should be loaded.
 
         Yields:
-            tuple[Path, byte]: Tuple of a path to every ingested file and its content.
+            tuple[Path, bytes | memoryview]: Tuple of the path and the file's content.
         """
-        for file in files:
-            yield file, file.read_bytes()
+        if self.mmap:
+            yield from _map(file)
+        else:
+            yield file, read_bytes(file)
 
 
 class Text(Ingest):
     __slots__ = ('encoding',)
+    immutable = True
 
-    def __init__(self, encoding='utf-8') -> None:
+    def __init__(self, encoding='utf-8', prefetch: int = 0) -> None:
         """Text ingest.
 
         Args:
             encoding (str, optional): Encoding to use when reading files. Defaults to 'utf-8'.
+            prefetch (int, optional): Amount of files to read ahead. Defaults to 0.
         """
+        super().__init__(prefetch)
         self.encoding = encoding
 
-    def ingest(self, files: Iterable[Path]) -> Iterable[tuple[Path, str]]:
-        """Ingests files as text.
+    def load(self, file: Path) -> Iterable[tuple[Path, str]]:
+        """Loads a file as text.
 
         Args:
-            files (Iterable[Path]):  An iterable of Paths that should be ingested.
+            file (Path): Path to the file that should be loaded.
 
         Yields:
-            tuple[Path, Any]: Tuple of a path to every ingested file and its content.
+            tuple[Path, str]: Tuple of the path and the file's content.
         """
-        for file in files:
-            yield file, file.read_text(self.encoding)
+        yield file, read_text(file, self.encoding)
 
 
 class Json(Ingest):
-    __slots__ = ()
+    __slots__ = ('schema', 'backend')
 
-    def ingest(self, files: Iterable[Path]):
-        """Ingests JSON files.
+    def __init__(self, schema: Optional[type[BaseModel]] = None,
+                 backend: Optional[str] = None, prefetch: int = 0) -> None:
+        """JSON ingest.
 
         Args:
-            files (Iterable[Path]):  An iterable of Paths that should be ingested.
+            schema (Optional[type[BaseModel]], optional): Decode files straight into this pydantic model,
+                which skips building intermediate Python objects. Files that fail validation are skipped
+                with a warning. The extension's :code:`validate` step passes validated models through.
+                Defaults to None.
+            backend (Optional[str], optional): JSON parser to use if no schema is given, one of `orjson`,
+                                               `msgspec` or `json`. Defaults to the fastest available.
+            prefetch (int, optional): Amount of files to read ahead. Defaults to 0.
+        """
+        super().__init__(prefetch)
+        self.schema = schema
+        self.backend = backend
+
+    def load(self, file: Path) -> Iterable[tuple[Path, Any]]:
+        """Loads a JSON file.
+
+        Args:
+            file (Path): Path to the file that should be loaded.
 
         Yields:
-            tuple[Path, Any]: Tuple of a path to every ingested file and its content.
+            tuple[Path, Any]: Tuple of the path and the file's content.
         """
-        import json
-        for path in files:
-            yield path, json.loads(path.read_bytes())
+        if self.schema is None:
+            yield file, loads_json(read_bytes(file), self.backend)
+            return
+
+        try:
+            yield file, self.schema.model_validate_json(read_bytes(file))
+        except ValidationError as exc:
+            _logger.warning("%s failed validation.", file)
+            for error in exc.errors():
+                _logger.warning("  %s: %s (type=%s)",
+                                '.'.join(str(loc) for loc in error['loc']), error['msg'], error['type'])
 
 
 class Toml(Ingest):
     __slots__ = ()
 
-    def ingest(self, files: Iterable[Path]) -> Iterable[tuple[Path, dict[str, Any]]]:
-        """Ingests TOML files. This uses Python's standard library tomllib if available.
+    def load(self, file: Path) -> Iterable[tuple[Path, dict[str, Any]]]:
+        """Loads a TOML file. Files that fail to parse are skipped with a warning.
+        This uses Python's standard library tomllib if available, see :code:`palgen.machinery.formats`.
 
         Args:
-            files (Iterable[Path]):  An iterable of Paths that should be ingested.
+            file (Path): Path to the file that should be loaded.
 
         Yields:
-            tuple[Path, dict[str, Any]]: Tuple of a path to every ingested file and its content.
+            tuple[Path, dict[str, Any]]: Tuple of the path and the file's content.
         """
-        import toml
-        for path in files:
-            try:
-                yield path, toml.loads(path.read_text())
-            except toml.TomlDecodeError as exc:
-                _logger.warning("Could not load %s", path)
-                _logger.warning("Reason: %s", exc.msg)
+        try:
+            yield file, loads_toml(read_bytes(file))
+        except TomlError as exc:
+            _logger.warning("Could not load %s", file)
+            _logger.warning("Reason: %s", exc.msg)
+
+
+def _load_all(load: Callable[[Path], Iterable[tuple[Path, Any]]], file: Path) -> list[tuple[Path, Any]]:
+    return list(load(file))
+
+
+def _map(file: Path) -> Iterable[tuple[Path, memoryview]]:
+    if (isinstance(file, VirtualPath) and file.is_virtual) or compression_of(file) is not None:
+        yield file, memoryview(read_bytes(file))
+        return
+
+    with open(file, 'rb') as stream:
+        if os.fstat(stream.fileno()).st_size <= content.MMAP_THRESHOLD:
+            # empty files cannot be mapped
+            yield file, memoryview(stream.read())
+            return
+
+        mapping = _mmap.mmap(stream.fileno(), 0, access=_mmap.ACCESS_READ)
+
+    view = memoryview(mapping)
+    try:
+        yield file, view
+    finally:
+        del view
+        try:
+            mapping.close()
+        except BufferError:
+            # downstream steps still hold a view, the mapping is closed once that is released
+            pass
@@ -0,0 +1,231 @@
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Hashable, Iterable, Iterator, Optional
+
+from ..machinery.resources import memory_limit
+from ..machinery.virtual import VirtualPath
+
+_logger = logging.getLogger(__name__)
+
+# upper bound if the process' memory is not limited
+MEMO_SIZE = 1 << 28
+
+_active: Optional['Memo'] = None
+
+
+def options_of(ingest: Any) -> tuple[tuple[str, str], ...]:
+    """Options of an ingest step which affect its results, as found in its slots and instance dictionary.
+
+    Args:
+        ingest (Any): Ingest step
+
+    Returns:
+        tuple[tuple[str, str], ...]: Names and representations of all options
+    """
+    names = [name
+             for klass in type(ingest).__mro__
+             for name in getattr(klass, '__slots__', ())
+             if name not in ('prefetch', '__dict__', '__weakref__')]
+    # subclasses without `__slots__` keep their options in the instance dictionary
+    names.extend(sorted(getattr(ingest, '__dict__', {})))
+    return tuple((name, repr(getattr(ingest, name, None))) for name in names)
+
+
+class Memo:
+    __slots__ = 'capacity', 'folder', 'entries', 'used', 'lock', 'hits', 'misses'
+
+    def __init__(self, capacity: Optional[int] = None, folder: Optional[Path] = None) -> None:
+        """Memory-bounded memo of ingested files, shared by every ingest step while it is active.
+        Identical ingest steps of different extensions only read and parse a file once.
+
+        Entries are keyed by ingest class, options and path and dropped if the file's size or
+        modification time changed. Results of steps that are not :code:`immutable` are stored
+        pickled and every reader gets its own copy. The least recently used entries are evicted
+        once the stored results exceed the capacity.
+
+        Worker processes forked while the memo is active get a copy of it. If :code:`folder` is given,
+        pickled results are additionally stored in it, so that they are shared with every other worker.
+        A file being parsed by one worker is waited for by the others instead of being parsed again.
+
+        Args:
+            capacity (Optional[int], optional): Maximum size of stored results in bytes.
+                Defaults to an eighth of the process' memory limit, at most 256 MiB.
+            folder (Optional[Path], optional): Folder to share results between worker processes in.
+                It is owned by the caller and should be empty. Defaults to None.
+        """
+        if capacity is None:
+            limit = memory_limit()
+            capacity = MEMO_SIZE if limit is None else min(limit // 8, MEMO_SIZE)
+
+        self.capacity = capacity
+        self.folder = folder
+        self.entries: OrderedDict[Hashable, tuple[tuple[int, int], int, bool, Any]] = OrderedDict()
+        self.used = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, ingest: Any, file: Path) -> Iterable[tuple[Path, Any]]:
+        """Loads a file through :code:`ingest`, unless it has been loaded the same way before.
+
+        Args:
+            ingest (Any): Ingest step implementing :code:`load`
+            file (Path): File to load
+
+        Returns:
+            Iterable[tuple[Path, Any]]: Tuples of the path and the file's content.
+        """
+        load: Callable[[Path], Iterable[tuple[Path, Any]]] = ingest.load
+        if not isinstance(file, Path) or (isinstance(file, VirtualPath) and file.is_virtual):
+            # in-memory files of different extensions may share paths
+            return load(file)
+
+        try:
+            stat = file.stat()
+        except OSError:
+            return load(file)
+
+        key = (type(ingest), options_of(ingest), file)
+        stamp = (stat.st_size, stat.st_mtime_ns)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return _restore(file, entry[2], entry[3])
+
+        if self.folder is None:
+            return self._load(key, stamp, ingest, file)
+
+        shared = self.folder / hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        with _locked(shared.with_suffix('.lock')):
+            if (data := _read_shared(shared, stamp)) is None:
+                return self._load(key, stamp, ingest, file, shared)
+
+            with self.lock:
+                self.hits += 1
+
+            # parsed by another worker
+            contents = pickle.loads(data)
+            if getattr(ingest, 'immutable', False):
+                self._store(key, (stamp, stat.st_size, True, contents))
+            else:
+                self._store(key, (stamp, len(data), False, data))
+            return [(file, content) for content in contents]
+
+    def _load(self, key: Hashable, stamp: tuple[int, int], ingest: Any, file: Path,
+              shared: Optional[Path] = None) -> list[tuple[Path, Any]]:
+        with self.lock:
+            self.misses += 1
+
+        results = list(ingest.load(file))
+        contents = [content for _, content in results]
+        immutable = getattr(ingest, 'immutable', False)
+
+        data: Optional[bytes] = None
+        if shared is not None or not immutable:
+            try:
+                data = pickle.dumps(contents, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                _logger.debug("Not memoizing %s: %s", file, exc)
+                return results
+
+        if immutable:
+            self._store(key, (stamp, stamp[0], True, contents))
+        elif data is not None:
+            self._store(key, (stamp, len(data), False, data))
+
+        if shared is not None and data is not None:
+            _write_shared(shared, stamp, data)
+        return results
+
+    def _store(self, key: Hashable, entry: tuple[tuple[int, int], int, bool, Any]) -> None:
+        size = entry[1]
+        if size > self.capacity:
+            return
+
+        with self.lock:
+            if (previous := self.entries.pop(key, None)) is not None:
+                self.used -= previous[1]
+
+            while self.entries and self.used + size > self.capacity:
+                _, evicted = self.entries.popitem(last=False)
+                self.used -= evicted[1]
+
+            self.entries[key] = entry
+            self.used += size
+
+    def __enter__(self) -> 'Memo':
+        global _active  # pylint: disable=global-statement
+        assert _active is None, "Another ingest memo is already active"
+        _active = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        global _active  # pylint: disable=global-statement
+        _active = None
+
+        _logger.debug("Ingest memo: %d hits, %d misses", self.hits, self.misses)
+        self.entries.clear()
+        self.used = 0
+
+
+def current_memo() -> Optional[Memo]:
+    """Currently active ingest memo.
+
+    Returns:
+        Optional[Memo]: The active memo or None if every ingest step should load files on its own.
+    """
+    return _active
+
+
+def _restore(file: Path, immutable: bool, stored: Any) -> list[tuple[Path, Any]]:
+    contents = stored if immutable else pickle.loads(stored)
+    return [(file, content) for content in contents]
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    if sys.platform == 'win32':
+        # no advisory locks, workers might parse the same file concurrently
+        yield
+        return
+
+    import fcntl
+    with open(path, 'wb') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read_shared(path: Path, stamp: tuple[int, int]) -> Optional[bytes]:
+    try:
+        with open(path, 'rb') as stream:
+            stored_stamp, data = pickle.load(stream)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        _logger.debug("Discarding shared memo entry %s: %s", path, exc)
+        return None
+    return data if stored_stamp == stamp and isinstance(data, bytes) else None
+
+
+def _write_shared(path: Path, stamp: tuple[int, int], data: bytes) -> None:
+    try:
+        # write atomically, like entries of the persistent cache
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as stream:
+            pickle.dump((stamp, data), stream, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(stream.name, path)
+    except OSError as exc:
+        _logger.debug("Could not share memo entry %s: %s", path, exc)
@@ -1,7 +1,25 @@
 #pylint: disable=invalid-name
 
-from pathlib import Path
-from typing import Iterable
+import sys
+from pathlib import Path, PurePath
+from typing import Any, Iterable
+
+# before Python 3.12 every new path parses its string eagerly. Paths derived from the parts
+# parsed during discovery skip that, their string is only formatted once it is needed.
+_ConcretePath: type[Path] = type(Path())
+_FROM_PARTS = sys.version_info < (3, 12) and hasattr(PurePath, '_from_parsed_parts')
+
+
+def _from_parts(drive: str, root: str, parts: list[str]) -> Path:
+    # private pathlib API, tests compare its results with the public API of the running interpreter
+    path: Path = _ConcretePath._from_parsed_parts(  # type: ignore[attr-defined]  # pylint: disable=protected-access
+        drive, root, parts)
+    return path
+
+
+def _is_plain(path: Any) -> bool:
+    # subclasses, ie. virtual paths, keep their state only when derived through the public API
+    return type(path) is _ConcretePath  # pylint: disable=unidiomatic-typecheck
 
 
 def Relative(self, files: Iterable[Path]) -> Iterable[Path]:
@@ -10,11 +28,27 @@ def Relative(self, files: Iterable[Path]) -> Iterable[Path]:
     Args:
         files (Iterable[Path]): Iterable of file paths.
 
+    Raises:
+        ValueError: A file is not inside the project root.
+
     Yields:
         Path: Resulting relative paths.
     """
+    root = self.root_path
+    if not _FROM_PARTS or not _is_plain(root):
+        for file in files:
+            yield file.relative_to(root)
+        return
+
+    anchor = root.parts
+    size = len(anchor)
     for file in files:
-        yield file.relative_to(self.root_path)
+        # virtual paths keep their content when derived through pathlib
+        if _is_plain(file) and (parts := file.parts)[:size] == anchor:
+            yield _from_parts('', '', list(parts[size:]))
+        else:
+            yield file.relative_to(root)
+
 
 def Absolute(self, files: Iterable[Path]) -> Iterable[Path]:
     """Turns relative (to the project root) file paths into absolute file paths.
@@ -25,5 +59,19 @@ def Absolute(self, files: Iterable[Path]) -> Iterable[Path]:
     Yields:
         Path: Resulting absolute paths.
     """
+    root = self.root_path
+    if not _FROM_PARTS or not _is_plain(root):
+        for file in files:
+            yield root / file
+        return
+
+    anchor = root.parts
     for file in files:
-        yield self.root_path / file
+        if _is_plain(file) and not file.anchor:
+            yield _from_parts(root.drive, root.root, [*anchor, *file.parts])
+        else:
+            yield root / file
+
+
+# both only change the folder paths are relative to, filters on file names may run before them
+Relative.rebases = Absolute.rebases = True  # type: ignore[attr-defined]
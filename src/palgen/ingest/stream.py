@@ -0,0 +1,193 @@
+import csv
+import io
+import logging
+import os
+from pathlib import Path
+from typing import Any, Iterable, Iterator, NamedTuple, Optional
+
+from ..machinery.formats import loads_json
+from ..machinery.virtual import VirtualPath
+from .compression import compression_of, open_binary
+from .loader import Ingest
+
+_logger = logging.getLogger(__name__)
+
+# files smaller than this are never split
+SPLIT_SIZE = 1 << 25
+
+
+class Span(NamedTuple):
+    """Byte range of a file. `start` is always at the beginning of a record."""
+    path: Path
+    start: int
+    end: int
+
+
+class Stream(Ingest):
+    """Ingests files record by record. Only one record is held in memory at a time.
+
+    If the ingest step runs on multiple jobs, large files are split into spans at record
+    boundaries, so that several workers can process parts of a single file in parallel.
+    """
+
+    __slots__ = ('split_size',)
+    # keeping every record of a file around defeats streaming
+    memoize = False
+
+    def __init__(self, split_size: Optional[int] = SPLIT_SIZE) -> None:
+        """
+        Args:
+            split_size (Optional[int], optional): Minimum size of the spans a file is split into.
+                                                  Defaults to 32 MiB. Use None to never split files.
+        """
+        super().__init__()
+        self.split_size = split_size
+
+    def split_inputs(self, files: Iterable[Path], parts: int) -> Iterable[Path | Span]:
+        """Splits large files into spans at record boundaries. Called by the pipeline
+        before the ingest step runs on multiple jobs.
+
+        Args:
+            files (Iterable[Path]): Files to ingest
+            parts (int): Amount of jobs the spans will be distributed on
+
+        Yields:
+            Path | Span: Small files as they are and spans of large files
+        """
+        for file in files:
+            if (self.split_size is None or (isinstance(file, VirtualPath) and file.is_virtual)
+                    or compression_of(file) is not None):
+                # compressed files cannot be read from an offset without decompressing everything before it
+                yield file
+                continue
+
+            size = os.stat(file).st_size
+            step = max(self.split_size, -(-size // max(parts, 1)))
+            if size <= step:
+                yield file
+                continue
+
+            with open(file, 'rb') as stream:
+                start = 0
+                while start < size:
+                    end = _boundary(stream, start + step, size)
+                    yield Span(file, start, end)
+                    start = end
+
+    def load(self, file: Path | Span) -> Iterable[tuple[Path, Any]]:
+        """Loads all records of a file or span.
+
+        Args:
+            file (Path | Span): File or span of a file that should be loaded.
+
+        Yields:
+            tuple[Path, Any]: Tuple of the file's path and a record.
+        """
+        path, start, end = file if isinstance(file, Span) else (file, 0, None)
+        with self._open(path) as stream:
+            for record in self.records(stream, start, end):
+                yield path, record
+
+    def records(self, stream: io.BufferedIOBase, start: int, end: Optional[int]) -> Iterator[Any]:
+        """Parses records from a binary stream.
+
+        Args:
+            stream (io.BufferedIOBase): Stream of the entire file
+            start (int): Offset of the first record to parse
+            end (Optional[int]): Offset after the last record to parse. None to parse until the end of the stream.
+
+        Yields:
+            Any: Parsed records
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _open(path: Path) -> io.BufferedIOBase:
+        return open_binary(path)  # type: ignore[return-value]
+
+    @staticmethod
+    def _lines(stream: io.BufferedIOBase, start: int, end: Optional[int]) -> Iterator[bytes]:
+        stream.seek(start)
+        position = start
+        while end is None or position < end:
+            line = stream.readline()
+            if not line:
+                return
+            position += len(line)
+            yield line
+
+
+class Lines(Stream):
+    __slots__ = ('encoding',)
+
+    def __init__(self, encoding: str = 'utf-8', split_size: Optional[int] = SPLIT_SIZE) -> None:
+        """Ingests files line by line. Lines are yielded without their line ending.
+
+        Args:
+            encoding (str, optional): Encoding to use when reading files. Defaults to 'utf-8'.
+            split_size (Optional[int], optional): Minimum size of the spans a file is split into.
+                                                  Defaults to 32 MiB. Use None to never split files.
+        """
+        super().__init__(split_size)
+        self.encoding = encoding
+
+    def records(self, stream: io.BufferedIOBase, start: int, end: Optional[int]) -> Iterator[str]:
+        for line in self._lines(stream, start, end):
+            yield line.decode(self.encoding).rstrip('\r\n')
+
+
+class JsonLines(Stream):
+    __slots__ = ('backend',)
+
+    def __init__(self, backend: Optional[str] = None, split_size: Optional[int] = SPLIT_SIZE) -> None:
+        """Ingests JSON Lines files, each line holds one JSON document. Blank lines are skipped.
+
+        Args:
+            backend (Optional[str], optional): JSON parser to use. Defaults to the fastest available.
+            split_size (Optional[int], optional): Minimum size of the spans a file is split into.
+                                                  Defaults to 32 MiB. Use None to never split files.
+        """
+        super().__init__(split_size)
+        self.backend = backend
+
+    def records(self, stream: io.BufferedIOBase, start: int, end: Optional[int]) -> Iterator[Any]:
+        for line in self._lines(stream, start, end):
+            if line.strip():
+                yield loads_json(line, self.backend)
+
+
+class Csv(Stream):
+    __slots__ = ('encoding', 'options')
+
+    def __init__(self, encoding: str = 'utf-8', split_size: Optional[int] = None, **options: Any) -> None:
+        """Ingests CSV files row by row. The first row names the columns, rows are yielded as dictionaries.
+
+        Args:
+            encoding (str, optional): Encoding to use when reading files. Defaults to 'utf-8'.
+            split_size (Optional[int], optional): Minimum size of the spans a file is split into.
+                Defaults to None, which never splits files. Only enable this if no quoted field
+                contains line breaks, files are split at line breaks.
+            **options: Formatting parameters passed on to :code:`csv.reader`, ie. `delimiter`
+        """
+        super().__init__(split_size)
+        self.encoding = encoding
+        self.options = options
+
+    def records(self, stream: io.BufferedIOBase, start: int, end: Optional[int]) -> Iterator[dict[str, str]]:
+        stream.seek(0)
+        header = next(csv.reader([stream.readline().decode(self.encoding)], **self.options), None)
+        if header is None:
+            return
+
+        lines = (line.decode(self.encoding) for line in self._lines(stream, max(start, stream.tell()), end))
+        yield from csv.DictReader(lines, fieldnames=header, **self.options)
+
+
+def _boundary(stream: io.BufferedIOBase, offset: int, size: int) -> int:
+    # records start right after a line break
+    if offset >= size:
+        return size
+
+    stream.seek(offset - 1)
+    stream.readline()
+    return min(stream.tell(), size)
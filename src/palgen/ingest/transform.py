@@ -1,16 +1,73 @@
 #pylint: disable=invalid-name
 
-def CompressKeys(data, namespace=None, separator='.'):
-    # TODO this is remaining from the old TOML ingest - update, document and test this
-    if namespace is None:
-        namespace = []
+from typing import Any, Iterable, Optional
 
+
+def CompressKeys(data: Any, namespace: Optional[list[str]] = None,
+                 separator: str = '.') -> Iterable[tuple[str, str, dict[str, Any]]]:
+    """Flattens nested tables, ie. of a TOML document, into the tables that hold actual values.
+
+    Tables only containing other tables are descended into. Every table holding at least one value
+    that is not a table is yielded as a whole together with its dotted namespace and key, depth first
+    in insertion order. For example :code:`{'a': {'b': {'x': 1}, 'c': {'y': 2}}}` yields
+    :code:`('a', 'b', {'x': 1})` and :code:`('a', 'c', {'y': 2})`.
+
+    This walks the tables with an explicit stack, so arbitrarily deep tables do not hit the recursion limit.
+
+    Args:
+        data (Any): Nested tables. Yields nothing if this is not a dictionary.
+        namespace (Optional[list[str]], optional): Keys leading to `data`. Defaults to None.
+        separator (str, optional): Separator to join namespaces with. Defaults to '.'.
+
+    Yields:
+        tuple[str, str, dict[str, Any]]: Namespace, key and content of every table holding values.
+            If `data` itself holds values and no `namespace` is given, namespace and key are empty.
+    """
     if not isinstance(data, dict):
         return
 
-    if any(not isinstance(v, dict) for v in data.values()):
-        yield separator.join(namespace[:-1]), namespace[-1], data
-        return
+    # (namespace, key, table); key is None for the root if it has no name
+    stack: list[tuple[str, Optional[str], dict[str, Any]]] = [
+        (separator.join(namespace[:-1]), namespace[-1], data) if namespace else ('', None, data)]
+
+    while stack:
+        prefix, key, table = stack.pop()
+
+        children: list[tuple[str, dict[str, Any]]] = []
+        for child, value in table.items():
+            if not isinstance(value, dict):
+                yield prefix, key or '', table
+                break
+            children.append((child, value))
+        else:
+            inner = prefix if key is None else f"{prefix}{separator}{key}" if prefix else key
+            # reversed, so that children are popped in insertion order
+            stack.extend((inner, child, value) for child, value in reversed(children))
+
+
+def ExpandKeys(tables: Iterable[tuple[str, str, dict[str, Any]]], separator: str = '.') -> dict[str, Any]:
+    """Inverse of :code:`CompressKeys`. Nests tables back into their namespaces.
+
+    Tables are inserted as they are, not copied. Empty tables and keys containing `separator`
+    do not survive a round trip through :code:`CompressKeys`.
+
+    Args:
+        tables (Iterable[tuple[str, str, dict[str, Any]]]): Namespace, key and content of every table
+        separator (str, optional): Separator namespaces are joined with. Defaults to '.'.
+
+    Returns:
+        dict[str, Any]: Nested tables
+    """
+    root: dict[str, Any] = {}
+    for namespace, key, table in tables:
+        node = root
+        if namespace:
+            for part in namespace.split(separator):
+                node = node.setdefault(part, {})
+
+        if key:
+            node[key] = table
+        else:
+            node.update(table)
 
-    for key, value in data.items():
-        yield from CompressKeys(value, namespace + [key], separator)
+    return root
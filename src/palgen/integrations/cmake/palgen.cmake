@@ -14,11 +14,18 @@ macro(palgen_setup)
 endmacro()
 
 function(palgen_run target output_path)  
+    # let palgen share the job budget of make instead of oversubscribing the machine
+    set(PALGEN_JOB_SERVER "")
+    if(CMAKE_VERSION VERSION_GREATER_EQUAL 3.28)
+        set(PALGEN_JOB_SERVER JOB_SERVER_AWARE TRUE)
+    endif()
+
     add_custom_target(
         "palgen_${target}"
         ALL
         COMMAND palgen --debug --output ${output_path} --dependencies "\"${CMAKE_BINARY_DIR}/palgen.cache\""
         WORKING_DIRECTORY ${CMAKE_SOURCE_DIR}
+        ${PALGEN_JOB_SERVER}
     )
 
     add_dependencies(${target} "palgen_${target}")
@@ -5,6 +5,7 @@ import toml
 from conan import ConanFile
 from conan.tools.files import save
 from palgen.loaders import ManifestSchema
+from palgen.machinery.formats import load_toml
 from palgen import Palgen
 from palgen.schemas.palgen import PalgenSettings
 
@@ -14,7 +15,7 @@ def generate_manifest(conan_file: ConanFile):
         package_folder = Path(dependency.package_folder).resolve()
         if (probe := package_folder / 'palgen.manifest').exists():
             logging.debug("Found manifest at %s", probe)
-            file = toml.load(probe)
+            file = load_toml(probe)
             manifest = ManifestSchema.model_validate(file)
 
             for name, path_str in manifest.items():
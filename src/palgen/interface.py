@@ -1,20 +1,31 @@
 import logging
+import os
 import textwrap
 import traceback
+from contextlib import ExitStack
+from functools import cache
+from itertools import islice
 from pathlib import Path
 from typing import Any, Iterable, Optional
 
 from pydantic import BaseModel as Model
-from pydantic import RootModel, ValidationError
+from pydantic import RootModel, TypeAdapter, ValidationError
 from pydantic_core import PydanticUndefined
 
 from .ingest import Name, Nothing, Suffix, Toml
 from .machinery import Pipeline as Sources
 from .machinery import setattr_default
+from .machinery.pipeline import partition
+from .machinery.resources import cpu_count
+from .machinery.scheduler import Scheduler, WorkerPool, current_pool
+from .machinery.virtual import Generated, Unchanged, count_unchanged
 from .schemas import ProjectSettings
 
 _logger = logging.getLogger(__name__)
 
+# items validated at once by the default `validate` step
+VALIDATE_BATCH = 256
+
 
 def max_jobs(amount: int):
     def wrapper(fnc):
@@ -26,19 +37,23 @@ def max_jobs(amount: int):
 class Extension:
     Settings: Optional[type[Model]] = None  # Schema for extension configuration
     Schema: Optional[type[Model]] = None   # Optional schema to be used to validate each ingested item.
+    trusted: bool = False                  # Construct `Schema` objects without validating them.
+    # Only enable this for inputs that are known to be valid, ie. generated by a validated previous run
 
     name: str               # Extension name. Defaults to lowercase class name
     description: str        # Description of this extension. Automatically dedented,
     # can be the docstring of this class.
     private: bool           # Whether this extension is local to this project.
     # Setting this to true mangles the import name
+    after: list[str]        # Names of extensions which must finish before this one may run
+    consumes: list[str]     # Names of extensions whose generated files are added to this one's inputs
 
     # pipelines
     ingest: Sources | dict[str, Sources] | None    # Pipeline used to select and read input files
     pipeline: Sources | dict[str, Sources] | None  # Overall extension pipeline.
     # Override this if you want to disable all default steps
 
-    __slots__ = ('root_path', 'out_path', 'project', 'settings')
+    __slots__ = ('root_path', 'out_path', 'project', 'settings', 'handoff')
 
     def transform(self, data: Iterable[tuple[Path, Any]]) -> Iterable[tuple[Path, Any]]:
         """This step is intended to transform input data to something
@@ -58,7 +73,8 @@ class Extension:
         """Intended to validate elements in the :code:`data` Iterable against
         the pydantic schema :code:`Schema` of this extension.
 
-        By default passes through whatever it received.
+        By default validates batches of items at once and skips invalid items with a warning.
+        Passes through whatever it received if there is no :code:`Schema`.
 
         Args:
             data (Iterable[tuple[Path, Any]]): Iterable of inputs from the :code:`transform` step
@@ -66,15 +82,55 @@ class Extension:
         Yields:
             tuple[Path, BaseModel | Any]: Input file path and validated :code:`Schema` object
         """
-        if self.Schema is not None:
-            for path, value in data:
-                try:
-                    yield path, self.Schema.parse_obj(value)
-                except ValidationError as ex:
-                    _logger.warning("%s failed validation.", path)
-                    _print_validationerror(ex)
-        else:
+        if self.Schema is None:
             yield from data
+            return
+
+        for batch in _batched(data, VALIDATE_BATCH):
+            yield from self._validate_batch(batch)
+
+    def _validate_batch(self, batch: list[tuple[Path, Any]]) -> Iterable[tuple[Path, Any]]:
+        assert self.Schema is not None
+        results: list[Any] = [value for _, value in batch]
+        failed: set[int] = set()
+        # already validated, ie. by `Json(schema=...)`
+        pending = [idx for idx, value in enumerate(results) if not isinstance(value, self.Schema)]
+
+        if self.trusted:
+            root = issubclass(self.Schema, RootModel)
+            for idx in pending:
+                value = results[idx]
+                results[idx] = self.Schema.model_construct(value) if root else self.Schema.model_construct(**value)
+            pending = []
+
+        adapter = _list_adapter(self.Schema)
+        while pending:
+            try:
+                validated = adapter.validate_python([results[idx] for idx in pending])
+            except ValidationError as ex:
+                # the first location of every error is the position of the invalid item
+                errors: dict[int, list[Any]] = {}
+                for error in ex.errors():
+                    position = error['loc'][0]
+                    assert isinstance(position, int), "List validation errors start with the item's position"
+                    errors.setdefault(pending[position], []).append(error)
+
+                for idx, item_errors in errors.items():
+                    _logger.warning("%s failed validation.", batch[idx][0])
+                    _print_errors(item_errors, skip=1)
+
+                # all remaining items are valid, validate them again to get their models
+                failed.update(errors)
+                pending = [idx for idx in pending if idx not in errors]
+                continue
+
+            for idx, value in zip(pending, validated):
+                results[idx] = value
+            pending = []
+
+        for idx, (path, _) in enumerate(batch):
+            if idx not in failed:
+                yield path, results[idx]
 
     def render(self, data: Iterable[tuple[Path, Model | Any]]) -> Iterable[tuple[Path, str | bytes]]:
         """Intended to render the output content.
@@ -98,28 +154,41 @@ class Extension:
         yield from data  # type: ignore [unreachable]
 
     def write(self, output: Iterable[tuple[Path, str | bytes]]) -> Iterable[Path]:
-        """Write the rendered files back to disk.
+        """Write the rendered files back to disk. Files whose content did not change are left untouched,
+        so that build systems do not consider them out of date.
 
         Args:
             output (Iterable[tuple[Path, str]]): Iterable of inputs from the :code:`render` step
 
         Yields:
-            Path: Path to every generated file
+            Path: Path to every generated file. If another extension consumes this one's
+                  output, the generated content is attached to it. Paths of files that
+                  have not been written have their :code:`unchanged` attribute set.
         """
         for filename, generated in output:
             filename = self.out_path / filename
-            filename.parent.mkdir(parents=True, exist_ok=True)
-            with open(filename, "wb+" if isinstance(generated, bytes) else "w+",
-                                encoding=None if isinstance(generated, bytes) else "utf8") as file:
-                file.write(generated)
-
-            _logger.debug("Generated `%s`", filename)
-            yield filename
+            content = _encode(generated)
+
+            unchanged = _unchanged(filename, content)
+            if unchanged:
+                _logger.debug("Unchanged `%s`", filename)
+            else:
+                filename.parent.mkdir(parents=True, exist_ok=True)
+                filename.write_bytes(content)
+                _logger.debug("Generated `%s`", filename)
+
+            if self.handoff:
+                path = Generated.of(filename, generated)
+                path.unchanged = unchanged
+                yield path
+            else:
+                yield Unchanged(filename) if unchanged else filename
 
     def run(self, files: list[Path], jobs: Optional[int] = None) -> list[Path]:
         """Runs the extension's pipeline.
-        If the pipeline is a dictionary, it will loop through each item and run
-        the associated pipeline. Otherwise, it will run the single pipeline.
+        If the pipeline is a dictionary, the inputs of all pipelines are selected in a single pass
+        over :code:`files` and the pipelines run concurrently on a shared job budget.
+        Otherwise, it will run the single pipeline.
 
         This method may be overridden for extensions that do not wish to use the
         default pipelines at all or need to do custom pipeline preprocessing.
@@ -135,16 +204,33 @@ class Extension:
         output: list[Path] = []
 
         if isinstance(self.pipeline, dict):
-            for key, pipeline in self.pipeline.items():
+            pipelines = self.pipeline
+            selected = partition(pipelines, files)
+
+            def run(key: str) -> list[Path]:
                 _logger.debug("Running pipeline `%s`", key)
-                output.extend(pipeline(files, obj=self, max_jobs=jobs))
+                return pipelines[key](selected[key], obj=self, max_jobs=jobs, selected=True)
+
+            with ExitStack() as stack:
+                if current_pool() is None:
+                    stack.enter_context(WorkerPool(jobs or cpu_count()))
+
+                # independent pipelines only run concurrently if more than one job is allowed
+                results = Scheduler({key: [] for key in pipelines},
+                                    jobs=min(len(pipelines), jobs or 1)).run(run)
+
+            for result in results.values():
+                output.extend(result)
         else:
             output = self.pipeline(files, obj=self, max_jobs=jobs)
 
-        _logger.info("Extension `%s` yielded %s file%s",
+        # this may run in worker processes, the paths tell whether they were written
+        unchanged = count_unchanged(output)
+        _logger.info("Extension `%s` yielded %s file%s%s",
                      self.name,
                      len(output),
-                     's' if len(output) > 1 else '')
+                     's' if len(output) > 1 else '',
+                     f", skipped writing {unchanged} unchanged" if unchanged else '')
 
         return output
 
@@ -156,8 +242,10 @@ class Extension:
         description = cls.description.replace('\n', f'\n{indentation}')
 
         pipeline: str = str(cls.pipeline)
+        plan: str = cls.pipeline.explain() if isinstance(cls.pipeline, Sources) else pipeline
         if isinstance(cls.pipeline, dict):
             pipeline = f'\n{indentation}'.join(f"{key}: {value}" for key, value in cls.pipeline.items())
+            plan = f'\n{indentation}'.join(f"{key}: {value.explain()}" for key, value in cls.pipeline.items())
 
         return f"""\
 Name:        {cls.name}
@@ -166,7 +254,8 @@ Description: {description}
 Options:     {_stringify_pydantic(cls.Settings, 13) or "No options"}
 Schema:      {_stringify_pydantic(cls.Schema, 13)   or "No schema"}
 
-Pipeline(s): {pipeline}"""
+Pipeline(s): {pipeline}
+Plan(s):     {plan}"""
 
     def __str__(self) -> str:
         return self.to_string()
@@ -191,6 +280,7 @@ Pipeline(s): {pipeline}"""
         self.root_path = root_path
         self.out_path = out_path
         self.settings: Model | None = None
+        self.handoff = False
 
         if self.Settings is None:
             return
@@ -222,6 +312,9 @@ Pipeline(s): {pipeline}"""
             name (str):        Name of the subclass. If no name is provided,
                                the name of the class converted to lowercase is used.
             private (bool):    Indicates whether the subclass should be private or not.
+            after (list[str]): Names of extensions this one has to run after. Defaults to none.
+            consumes (list[str]): Names of extensions whose generated files should be passed to this one
+                                  in memory. Implies :code:`after`. Defaults to none.
             ingest (Pipeline): Defaults :code:`ingest` to ingest toml files matching the extension name.
                                Use :code:`ingest = None` if you want to disable ingest.
 
@@ -237,6 +330,8 @@ Pipeline(s): {pipeline}"""
 
         setattr_default(cls, "name", name or cls.__name__.lower())
         setattr_default(cls, "private", private)
+        setattr_default(cls, "after", [])
+        setattr_default(cls, "consumes", [])
 
         setattr_default(cls, "ingest", Sources() >> Suffix('toml')
                                                  >> Name(getattr(cls, "name"))
@@ -291,13 +386,55 @@ def _check_schema_attribute(cls: type, name: str):
             f"Schema {name} of class `{cls.__name__}` isn't a pydantic model."
 
 
+def _encode(content: str | bytes) -> bytes:
+    if isinstance(content, bytes):
+        return content
+
+    # equivalent to writing in text mode
+    if os.linesep != '\n':
+        content = content.replace('\n', os.linesep)
+    return content.encode('utf8')
+
+
+def _unchanged(path: Path, content: bytes, chunk_size: int = 1 << 20) -> bool:
+    # sizes are compared first, changed files usually do not have to be read at all
+    try:
+        if path.stat().st_size != len(content):
+            return False
+
+        view = memoryview(content)
+        with open(path, 'rb') as file:
+            for offset in range(0, len(content), chunk_size):
+                if file.read(chunk_size) != view[offset:offset + chunk_size]:
+                    return False
+        return True
+    except OSError:
+        return False
+
+
 def _print_validationerror(exception: ValidationError):
-    for error in exception.errors():
-        for loc in error["loc"]:
+    _print_errors(exception.errors())
+
+
+def _print_errors(errors: Iterable[Any], skip: int = 0):
+    for error in errors:
+        for loc in error["loc"][skip:]:
             _logger.warning("  %s", loc)
         _logger.warning("    %s (type=%s)", error["msg"], error["type"])
 
 
+@cache
+def _list_adapter(schema: type[Model]) -> TypeAdapter[list[Any]]:
+    # building validators of large schemas is expensive, share them between batches and extensions
+    return TypeAdapter(list[schema])  # type: ignore[valid-type]
+
+
+def _batched(data: Iterable[Any], size: int) -> Iterable[list[Any]]:
+    iterator = iter(data)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
 def _dedent_description(cls: type[Extension]):
     description = (getattr(cls, "description", cls.__doc__) or "").strip()
     starts_with_newline = description.startswith('\n')
@@ -2,10 +2,10 @@ import logging
 from pathlib import Path
 from typing import Iterable
 
-import toml
 from pydantic import RootModel
 
 from ..ingest.filter import Suffix
+from ..machinery.formats import load_toml
 from .loader import Loader, ExtensionInfo
 from .python import Python
 
@@ -55,7 +55,7 @@ class Manifest(Loader):
             _logger.warning("Could not find %s", source)
             return
 
-        file = toml.load(source)
+        file = load_toml(source)
         manifest = ManifestSchema.model_validate(file)
         _logger.debug("Loading from `%s`", source)
 
@@ -8,6 +8,7 @@ from typing import Iterable, Optional
 
 from ..interface import Extension
 from ..ingest import Suffix
+from ..machinery.virtual import VirtualPath
 from .ast_helper import AST
 from .loader import Loader, ExtensionInfo, Kind
 
@@ -108,6 +109,10 @@ class Python(Loader):
         if path.name.startswith('_') or path.suffix != '.py':
             return False
 
+        if isinstance(path, VirtualPath) and path.is_virtual:
+            # ie. archive members, these cannot be imported
+            return False
+
         try:
             ast = AST.load(path)
             if not any(ast.get_subclasses(Extension)):
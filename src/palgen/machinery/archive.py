@@ -0,0 +1,134 @@
+import io
+import logging
+import os
+import tarfile
+import threading
+import zipfile
+from pathlib import Path, PurePosixPath, PureWindowsPath
+from typing import IO, Any, Optional
+
+from .virtual import VirtualPath
+
+_logger = logging.getLogger(__name__)
+
+ZIP_SUFFIXES = ('.zip',)
+TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+_archives: dict[tuple[int, str], tuple[threading.Lock, zipfile.ZipFile | tarfile.TarFile]] = {}
+_lock = threading.Lock()
+
+
+def is_archive(path: Path) -> bool:
+    """
+    Args:
+        path (Path): path to check
+
+    Returns:
+        bool: True if `path` is a zip or tar archive that can be used as source folder
+    """
+    name = path.name.lower()
+    return name.endswith(ZIP_SUFFIXES + TAR_SUFFIXES) and path.is_file()
+
+
+class Member(VirtualPath):
+    """File inside a zip or tar archive. Its path is the archive's path followed by the member's name,
+    ie `data/pack.zip/foo/bar.json`. Reading it streams the member out of the archive without extracting it.
+
+    Zip members are accessed randomly. Members of compressed tar archives are found by decompressing
+    the archive up to the member, reading them in archive order is fastest.
+    """
+
+    archive: str
+    member: str
+
+    @classmethod
+    def of(cls, archive: Path, member: str) -> 'Member':
+        """
+        Args:
+            archive (Path): path to the archive
+            member (str): name of the member inside the archive
+
+        Returns:
+            Member: Path object
+        """
+        path = cls(archive / member)
+        path.archive = str(archive)
+        path.member = member
+        return path
+
+    def virtual_bytes(self) -> bytes:
+        with self.open('rb') as stream:
+            content: bytes = stream.read()
+        return content
+
+    def open(self, mode: str = 'r', buffering: int = -1, encoding: Optional[str] = None,
+             errors: Optional[str] = None, newline: Optional[str] = None) -> IO[Any]:
+        if not self.is_virtual or any(flag in mode for flag in 'wax+'):
+            return super().open(mode, buffering, encoding, errors, newline)
+
+        lock, archive = _open_archive(self.archive)
+        with lock:
+            if isinstance(archive, zipfile.ZipFile):
+                # zipfile serializes reads of concurrently open members on its own
+                raw: IO[bytes] = archive.open(self.member)
+            else:
+                # tarfile is not thread-safe, read the member at once
+                extracted = archive.extractfile(self.member)
+                if extracted is None:
+                    raise IsADirectoryError(f"{self} is not a regular file")
+                raw = io.BytesIO(extracted.read())
+
+        if 'b' in mode:
+            return raw
+        return io.TextIOWrapper(raw, encoding or 'utf-8', errors, newline)
+
+
+def members(archive: Path) -> list[Member]:
+    """Lists all regular files inside a zip or tar archive.
+
+    Args:
+        archive (Path): path to the archive
+
+    Returns:
+        list[Member]: paths to the archive's files
+    """
+    lock, opened = _open_archive(str(archive))
+    with lock:
+        if isinstance(opened, zipfile.ZipFile):
+            names = [info.filename for info in opened.infolist() if not info.is_dir()]
+        else:
+            names = [info.name for info in opened.getmembers() if info.isfile()]
+
+    return [Member.of(archive, name) for name in names if _is_safe(archive, name)]
+
+
+def close_archives() -> None:
+    """Closes all archives this process opened to read members. They are opened again on the next read."""
+    with _lock:
+        opened = [archive for (pid, _), archive in _archives.items() if pid == os.getpid()]
+        _archives.clear()
+
+    for lock, archive in opened:
+        with lock:
+            archive.close()
+
+
+def _is_safe(archive: Path, name: str) -> bool:
+    # like tarfile's `data` filter, members must stay below the archive's path
+    posix, windows = PurePosixPath(name), PureWindowsPath(name)
+    if posix.is_absolute() or windows.anchor or '..' in posix.parts or '..' in windows.parts:
+        _logger.warning("Skipping member `%s` of %s, it points outside of the archive", name, archive)
+        return False
+    return True
+
+
+def _open_archive(path: str) -> tuple[threading.Lock, zipfile.ZipFile | tarfile.TarFile]:
+    # forked workers must not share file offsets with their parent
+    key = (os.getpid(), path)
+    with _lock:
+        if (opened := _archives.get(key)) is None:
+            # kept open until close_archives
+            # pylint: disable-next=consider-using-with
+            archive = zipfile.ZipFile(path) if path.lower().endswith(ZIP_SUFFIXES) else tarfile.open(path)
+            opened = _archives[key] = (threading.Lock(), archive)
+        return opened
@@ -6,6 +6,10 @@ from typing import Optional
 from pathspec import PathSpec
 from pathspec.patterns.gitwildmatch import GitWildMatchPattern
 
+from .archive import is_archive, members
+from .jobserver import reserve
+from .resources import cpu_count
+
 _logger = logging.getLogger(__name__)
 
 
@@ -40,13 +44,13 @@ def walk(path: Path, ignores: PathSpec = PathSpec([]), jobs: Optional[int] = Non
         path (Path): Path to the directory to traverse
         ignores (PathSpec): A PathSpec object representing the patterns to ignore when traversing the directory.
         jobs (Optional[int], optional): An integer representing the number of concurrent jobs to use for traversal.
-                                        Defaults to None, meaning however many CPU cores the system has.
+                                        Defaults to None, meaning however many CPU cores are usable.
 
     Returns:
         Iterable[Path]: An iterable object representing the files and folders found in the directory.
     """
     tasks, output = _walk_worker((path, ignores))
-    with Pool(processes=jobs) as pool:
+    with reserve(jobs or cpu_count()) as granted, Pool(processes=granted) as pool:
         while tasks:
             ret = pool.imap_unordered(_walk_worker, tasks.copy())
             tasks = []
@@ -65,17 +69,21 @@ def discover(paths: list[Path], ignores: Optional[PathSpec] = None, jobs: Option
         ignores (Optional[PathSpec], optional): Patterns to match files and folders which ought to be ignored.
             You probably want to use :code:`gitignore(...)` to get a :code:`PathSpec` object for this parameter.
         jobs (Optional[int], optional): Amount of jobs to run this at.
-            Defaults to None, meaning however many cpu cores the system has.
+            Defaults to None, meaning however many cpu cores are usable.
 
     Returns:
-        list[Path]: _description_
+        list[Path]: All non-ignored files and folders. Members of archives are :code:`Member` paths.
+
+    Note:
+        Zip and tar archives listed in :code:`paths` are not extracted. Their files are listed as
+        virtual paths below the archive's path instead, ie `data/pack.zip/foo.json`.
     """
     if ignores is None:
         ignores = PathSpec([])
 
     return [element
             for path in paths
-            for element in walk(path, ignores, jobs)]
+            for element in (_archive_members(path, ignores) if is_archive(path) else walk(path, ignores, jobs))]
 
 
 def find_backwards(filename: str, source_dir: Optional[Path] = None) -> Path:
@@ -101,6 +109,13 @@ def find_backwards(filename: str, source_dir: Optional[Path] = None) -> Path:
     raise FileNotFoundError(f"{filename} not found in parent directories.")
 
 
+def _archive_members(path: Path, ignores: PathSpec) -> list[Path]:
+    if ignores.match_file(path):
+        return []
+
+    return [member for member in members(path) if not ignores.match_file(member)]
+
+
 def _walk_worker(args: tuple[Path, PathSpec]) -> tuple[list[tuple[Path, PathSpec]], list[Path]]:
     path, ignores = args
     if not path.is_dir():
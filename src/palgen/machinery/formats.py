@@ -0,0 +1,167 @@
+import importlib
+import logging
+from functools import cache
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
+
+_logger = logging.getLogger(__name__)
+
+# preferred first, `toml` is always installed
+TOML_BACKENDS = ('tomllib', 'tomli', 'toml')
+
+
+class TomlBackend(NamedTuple):
+    name: str
+    loads: Callable[[str], dict[str, Any]]
+    error: type[Exception]
+
+
+@cache
+def toml_backend(name: Optional[str] = None) -> TomlBackend:
+    """Fastest available TOML parser.
+
+    Args:
+        name (Optional[str], optional): Use this backend instead. Defaults to the first importable of
+                                        :code:`tomllib`, :code:`tomli` and :code:`toml`.
+
+    Raises:
+        ImportError: The requested backend is not installed.
+
+    Returns:
+        TomlBackend: Name, parse function and exception type of the backend
+    """
+    for candidate in (name,) if name else TOML_BACKENDS:
+        try:
+            module = importlib.import_module(candidate)
+        except ImportError:
+            if name:
+                raise
+            continue
+
+        error = getattr(module, 'TOMLDecodeError', None) or getattr(module, 'TomlDecodeError')
+        _logger.debug("Using TOML backend `%s`", candidate)
+        return TomlBackend(candidate, module.loads, error)
+
+    raise ImportError("No TOML parser installed")
+
+
+class TomlError(ValueError):
+    def __init__(self, msg: str) -> None:
+        """Raised if a TOML document cannot be parsed, regardless of the backend in use.
+
+        Args:
+            msg (str): Reason reported by the backend
+        """
+        super().__init__(msg)
+        self.msg = msg
+
+
+def loads_toml(data: bytes | str, backend: Optional[str] = None) -> dict[str, Any]:
+    """Parses a TOML document.
+
+    Args:
+        data (bytes | str): TOML document, bytes are decoded as UTF-8
+        backend (Optional[str], optional): Name of the backend to use. Defaults to the fastest available.
+
+    Raises:
+        TomlError: The document is not valid TOML.
+
+    Returns:
+        dict[str, Any]: Parsed document
+    """
+    parser = toml_backend(backend)
+    try:
+        return parser.loads(data.decode('utf-8') if isinstance(data, bytes) else data)
+    except UnicodeDecodeError as exc:
+        raise TomlError(f"Invalid UTF-8: {exc.reason}") from exc
+    except parser.error as exc:
+        raise TomlError(getattr(exc, 'msg', None) or str(exc)) from exc
+
+
+def load_toml(path: Path, backend: Optional[str] = None) -> dict[str, Any]:
+    """Reads and parses a TOML file.
+
+    Args:
+        path (Path): Path to the TOML file
+        backend (Optional[str], optional): Name of the backend to use. Defaults to the fastest available.
+
+    Raises:
+        TomlError: The file is not valid TOML.
+
+    Returns:
+        dict[str, Any]: Parsed document
+    """
+    return loads_toml(path.read_bytes(), backend)
+
+
+# preferred first, `json` is part of the standard library
+JSON_BACKENDS = {
+    'orjson':  ('orjson.loads', 'orjson.JSONDecodeError'),
+    'msgspec': ('msgspec.json.decode', 'msgspec.DecodeError'),
+    'json':    ('json.loads', 'json.JSONDecodeError'),
+}
+
+
+class JsonBackend(NamedTuple):
+    name: str
+    loads: Callable[[bytes | str], Any]
+    error: type[Exception]
+
+
+@cache
+def json_backend(name: Optional[str] = None) -> JsonBackend:
+    """Fastest available JSON parser.
+
+    Args:
+        name (Optional[str], optional): Use this backend instead. Defaults to the first importable of
+                                        :code:`orjson`, :code:`msgspec` and :code:`json`.
+
+    Raises:
+        ImportError: The requested backend is not installed or unknown.
+
+    Returns:
+        JsonBackend: Name, parse function and exception type of the backend
+    """
+    if name is not None and name not in JSON_BACKENDS:
+        raise ImportError(f"Unknown JSON backend `{name}`")
+
+    for candidate in (name,) if name else JSON_BACKENDS:
+        loads, error = JSON_BACKENDS[candidate]
+        try:
+            backend = JsonBackend(candidate, _resolve(loads), _resolve(error))
+        except ImportError:
+            if name:
+                raise
+            continue
+
+        _logger.debug("Using JSON backend `%s`", candidate)
+        return backend
+
+    raise ImportError("No JSON parser installed")
+
+
+def loads_json(data: bytes | str, backend: Optional[str] = None) -> Any:
+    """Parses a JSON document.
+
+    Args:
+        data (bytes | str): JSON document
+        backend (Optional[str], optional): Name of the backend to use. Defaults to the fastest available.
+
+    Raises:
+        ValueError: The document is not valid JSON.
+
+    Returns:
+        Any: Parsed document
+    """
+    parser = json_backend(backend)
+    try:
+        return parser.loads(data)
+    except parser.error as exc:
+        if isinstance(exc, ValueError):
+            raise
+        raise ValueError(str(exc)) from exc
+
+
+def _resolve(name: str) -> Any:
+    module, attribute = name.rsplit('.', 1)
+    return getattr(importlib.import_module(module), attribute)
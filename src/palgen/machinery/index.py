@@ -0,0 +1,102 @@
+import functools
+import threading
+from pathlib import PurePath
+from typing import Any, Callable, Iterable, TypeVar
+
+Method = TypeVar('Method', bound=Callable[..., Any])
+
+# attributes of a path that can be indexed
+KEYS: dict[str, Callable[[PurePath], Iterable[str]]] = {
+    'suffix': lambda path: (''.join(path.suffixes),),
+    'name':   lambda path: (path.name,),
+    'stem':   lambda path: (path.stem,),
+    'part':   lambda path: path.parts,
+}
+
+
+def _invalidating(method: Method) -> Method:
+    # positions change, indexes are rebuilt on their next lookup
+    @functools.wraps(method)
+    def mutate(self: 'Files', *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        with self.lock:
+            self.indexes.clear()
+        return result
+    return mutate  # type: ignore[return-value]
+
+
+class Files(list):
+    """List of files which lazily builds inverted indexes over its paths.
+
+    Indexes map the joined suffix, name, stem or any part of a path to the positions
+    of all files having it. Each index is built on first lookup only and dropped
+    whenever the list is modified.
+    """
+
+    def __init__(self, files: Iterable[PurePath] = ()) -> None:
+        super().__init__(files)
+        self.indexes: dict[str, dict[str, list[int]]] = {}
+        self.lock = threading.Lock()
+
+    def index_by(self, key: str) -> dict[str, list[int]]:
+        """
+        Args:
+            key (str): One of `suffix`, `name`, `stem` or `part`
+
+        Returns:
+            dict[str, list[int]]: Attribute values mapped to the positions of all files having them
+        """
+        if (index := self.indexes.get(key)) is not None:
+            return index
+
+        with self.lock:
+            if key not in self.indexes:
+                index = {}
+                attribute = KEYS[key]
+                for position, file in enumerate(self):
+                    for value in set(attribute(file)):
+                        index.setdefault(value, []).append(position)
+                self.indexes[key] = index
+            return self.indexes[key]
+
+    def lookup(self, key: str, values: Iterable[str]) -> set[int]:
+        """
+        Args:
+            key (str): One of `suffix`, `name`, `stem` or `part`
+            values (Iterable[str]): Attribute values to look up
+
+        Returns:
+            set[int]: Positions of all files having any of the values
+        """
+        index = self.index_by(key)
+        return {position for value in values for position in index.get(value, ())}
+
+    def select(self, key: str, predicate: Callable[[str], Any]) -> set[int]:
+        """
+        Args:
+            key (str): One of `suffix`, `name`, `stem` or `part`
+            predicate (Callable[[str], Any]): Check for attribute values, called once for every distinct value
+
+        Returns:
+            set[int]: Positions of all files having a value that satisfies `predicate`
+        """
+        return {position
+                for value, positions in self.index_by(key).items() if predicate(value)
+                for position in positions}
+
+    append = _invalidating(list.append)
+    extend = _invalidating(list.extend)
+    insert = _invalidating(list.insert)
+    remove = _invalidating(list.remove)
+    pop = _invalidating(list.pop)
+    clear = _invalidating(list.clear)
+    sort = _invalidating(list.sort)
+    reverse = _invalidating(list.reverse)
+    __setitem__ = _invalidating(list.__setitem__)
+    __delitem__ = _invalidating(list.__delitem__)
+    __iadd__ = _invalidating(list.__iadd__)
+    __imul__ = _invalidating(list.__imul__)
+
+    def __reduce__(self):
+        # indexes and locks stay with the process that built them
+        return Files, (list(self),)
@@ -0,0 +1,204 @@
+import atexit
+import logging
+import os
+import shlex
+import stat
+import threading
+from contextlib import contextmanager
+from functools import cache
+from typing import Iterator, Mapping, Optional
+
+_logger = logging.getLogger(__name__)
+
+
+class Jobserver:
+    __slots__ = 'reader', 'writer', 'fds', 'tokens', 'lock'
+
+    def __init__(self, reader: int, writer: int, fds: tuple[int, ...] = ()) -> None:
+        """Client for the GNU make jobserver protocol.
+
+        Every process started by make implicitly owns one job slot. Additional
+        slots are represented by single byte tokens which must be read from
+        and later written back to the jobserver.
+
+        Args:
+            reader (int): File descriptor to read tokens from. Must be non-blocking.
+            writer (int): File descriptor to return tokens to
+            fds (tuple[int, ...], optional): Inherited file descriptors which have to be
+                                             passed on to child processes. Defaults to ().
+        """
+        self.reader = reader
+        self.writer = writer
+        self.fds = fds
+        self.tokens: list[bytes] = []
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls, environment: Optional[Mapping[str, str]] = None) -> Optional['Jobserver']:
+        """Connects to the jobserver advertised in :code:`MAKEFLAGS`.
+
+        Supports both the named pipe (:code:`--jobserver-auth=fifo:PATH`) and the
+        anonymous pipe (:code:`--jobserver-auth=R,W` or :code:`--jobserver-fds=R,W`) forms.
+
+        Args:
+            environment (Optional[Mapping[str, str]], optional): Environment to check. Defaults to os.environ.
+
+        Returns:
+            Optional[Jobserver]: Jobserver client or None if no usable jobserver was found.
+        """
+        if os.name != 'posix':
+            # Windows uses named semaphores, which are not supported
+            return None
+
+        makeflags = (environment if environment is not None else os.environ).get('MAKEFLAGS', '')
+        if not (auth := parse_makeflags(makeflags)):
+            return None
+
+        try:
+            if auth.startswith('fifo:'):
+                path = auth.removeprefix('fifo:')
+                return cls(os.open(path, os.O_RDONLY | os.O_NONBLOCK),
+                           os.open(path, os.O_WRONLY))
+
+            reader, writer = (int(fd) for fd in auth.split(','))
+            if reader < 0 or writer < 0:
+                # make explicitly disabled the jobserver for this process
+                return None
+
+            for fd in reader, writer:
+                # descriptors not passed on by make might have been reused for something else
+                if not stat.S_ISFIFO(os.fstat(fd).st_mode):
+                    raise ValueError(f"file descriptor {fd} is not a pipe")
+
+            if (nonblocking := _reopen_nonblocking(reader)) is None:
+                _logger.warning("Jobserver `%s` cannot be read without blocking, ignoring it", auth)
+                return None
+
+            return cls(nonblocking, writer, fds=(reader, writer))
+
+        except (OSError, ValueError) as exc:
+            _logger.warning("Could not connect to jobserver `%s`: %s. "
+                            "Prefix the command with `+` if it is run by make.", auth, exc)
+            return None
+
+    def acquire(self, amount: int) -> int:
+        """Tries to acquire up to :code:`amount` tokens without blocking.
+
+        Args:
+            amount (int): Maximum amount of tokens to acquire
+
+        Returns:
+            int: Amount of tokens actually acquired
+        """
+        acquired = 0
+        with self.lock:
+            while acquired < amount:
+                try:
+                    token = os.read(self.reader, 1)
+                except (BlockingIOError, InterruptedError):
+                    break
+
+                if not token:
+                    break
+
+                self.tokens.append(token)
+                acquired += 1
+        return acquired
+
+    def release(self, amount: Optional[int] = None) -> None:
+        """Returns tokens to the jobserver.
+
+        Args:
+            amount (Optional[int], optional): Amount of tokens to return. Defaults to all held tokens.
+        """
+        with self.lock:
+            amount = len(self.tokens) if amount is None else min(amount, len(self.tokens))
+            for _ in range(amount):
+                os.write(self.writer, self.tokens.pop())
+
+    def __repr__(self) -> str:
+        return f"Jobserver(reader={self.reader}, writer={self.writer}, tokens={len(self.tokens)})"
+
+
+def parse_makeflags(makeflags: str) -> Optional[str]:
+    """Extracts the jobserver authentication string from :code:`MAKEFLAGS`.
+
+    Args:
+        makeflags (str): Content of the :code:`MAKEFLAGS` environment variable
+
+    Returns:
+        Optional[str]: Value of the last :code:`--jobserver-auth` or :code:`--jobserver-fds` option
+    """
+    auth = None
+    for flag in shlex.split(makeflags):
+        if flag == '--':
+            # variable definitions follow
+            break
+
+        for option in '--jobserver-auth=', '--jobserver-fds=':
+            if flag.startswith(option):
+                auth = flag.removeprefix(option)
+    return auth
+
+
+@cache
+def jobserver() -> Optional[Jobserver]:
+    """Jobserver client for this process. Connects on first use.
+
+    Returns:
+        Optional[Jobserver]: Jobserver client or None if palgen is not run by a jobserver-aware build tool
+    """
+    if (client := Jobserver.from_environment()) is not None:
+        _logger.debug("Connected to jobserver")
+        atexit.register(client.release)
+    return client
+
+
+@contextmanager
+def reserve(jobs: int) -> Iterator[int]:
+    """Reserves job slots for the duration of the context.
+
+    Without a jobserver all :code:`jobs` slots are granted. Otherwise one slot is implied
+    and up to :code:`jobs - 1` extra tokens are taken from the jobserver.
+    Use this around anything that spawns workers or subprocesses in parallel.
+
+    Args:
+        jobs (int): Desired amount of job slots
+
+    Yields:
+        int: Granted amount of job slots. This is always at least 1.
+    """
+    client = jobserver()
+    if client is None or jobs <= 1:
+        yield max(jobs, 1)
+        return
+
+    acquired = client.acquire(jobs - 1)
+    if acquired + 1 < jobs:
+        _logger.debug("Jobserver granted %d of %d jobs", acquired + 1, jobs)
+
+    try:
+        yield acquired + 1
+    finally:
+        client.release(acquired)
+
+
+def pass_fds() -> tuple[int, ...]:
+    """File descriptors child processes need to inherit to access the jobserver.
+
+    Returns:
+        tuple[int, ...]: File descriptors for :code:`subprocess.Popen(pass_fds=...)`
+    """
+    client = jobserver()
+    return client.fds if client is not None else ()
+
+
+def _reopen_nonblocking(reader: int) -> Optional[int]:
+    # setting O_NONBLOCK on the inherited descriptor would affect all other
+    # processes sharing it. Opening it again creates a private file description.
+    try:
+        return os.open(f'/proc/self/fd/{reader}', os.O_RDONLY | os.O_NONBLOCK)
+    except OSError:
+        # no procfs. Polling the shared descriptor is racy, another process
+        # might take the token between select and read, which then blocks.
+        return None
@@ -3,10 +3,13 @@ import logging
 from pathlib import Path, PurePath
 from functools import partial, reduce
 from inspect import isfunction, isgenerator, ismethod, signature
-from multiprocessing import cpu_count
 from multiprocessing.pool import Pool
-from typing import Any, Callable, Generator, Iterable, Optional, Type
+from typing import Any, Callable, Generator, Iterable, Mapping, Optional, Type
 
+from .index import Files
+from .jobserver import reserve
+from .resources import cpu_count
+from .scheduler import WorkerPool, current_pool
 from .types import issubtype
 
 _logger = logging.getLogger(__name__)
@@ -20,7 +23,47 @@ Step = _Step | partial[_Step]
 def get_name(obj):
     if isinstance(obj, str):
         return obj
-    return obj.__name__ if hasattr(obj, "__name__") else type(obj).__name__
+    if hasattr(obj, "__name__"):
+        return obj.__name__
+    # objects defining their own string, ie. filters, describe themselves
+    custom = getattr(type(obj), '__str__') is not object.__str__
+    return str(obj) if custom else type(obj).__name__
+
+
+def _is_selectable(step: Any) -> bool:
+    # filters whose `matches` agrees with running them as a step
+    return callable(getattr(step, 'matches', None)) and getattr(step, 'selectable', False)
+
+
+def _reorder(steps: list[Step]) -> list[Step]:
+    # filters on file names give the same result before and after rebasing paths
+    # and filters are pure, so they can be moved ahead of both
+    steps = list(steps)
+    for idx, step in enumerate(steps):
+        if not (_is_selectable(step) and getattr(step, 'name_only', False)):
+            continue
+
+        target = idx
+        while target > 0 and (_is_selectable(steps[target - 1]) or getattr(steps[target - 1], 'rebases', False)):
+            target -= 1
+
+        # keep the filter's position relative to other filters unless it crosses a rebasing step
+        while target < idx and not getattr(steps[target], 'rebases', False):
+            target += 1
+
+        steps.insert(target, steps.pop(idx))
+    return steps
+
+
+def _fuse(steps: list[Step]) -> list[Step]:
+    # adjacent filters are evaluated as one predicate
+    fused: list[Step] = []
+    for step in steps:
+        if fused and _is_selectable(step) and _is_selectable(fused[-1]) and hasattr(fused[-1], '__and__'):
+            fused[-1] = fused[-1] & step
+        else:
+            fused.append(step)
+    return fused
 
 
 class PipelineMeta(type):
@@ -85,7 +128,9 @@ class Pipeline(metaclass=PipelineMeta):
                          if name != 'self')
         max_jobs = getattr(step, 'max_jobs', 1 if wants_list else 0)
 
-        if wants_list or max_jobs != self.tasks[-1].max_jobs:
+        # steps that can split their inputs have to start a task, their inputs are split before it runs
+        splits = callable(getattr(step, 'split_inputs', None)) and bool(self.tasks[-1])
+        if wants_list or splits or max_jobs != self.tasks[-1].max_jobs:
             self.tasks.append(Task(max_jobs=max_jobs))
 
         if isinstance(step, Pipeline) and step.initial_state is None:
@@ -116,47 +161,200 @@ class Pipeline(metaclass=PipelineMeta):
         for task in self.tasks:
             yield from self._run_task(state=state, obj=obj, task=task)
 
-    def filter_paths(self, paths: list[Path]):
+    def filter_paths(self, paths: Iterable[Path]):
         if not self.path_filters:
             yield from paths
             return
 
+        folders = tuple(self.path_filters)
+        required = set(folders)
+        width = len(folders)
+
         for source in paths:
             assert isinstance(source, Path)
-            for i in range(1 + len(source.parts) - len(self.path_filters)):
-                if self.path_filters == list(source.parts[i: i+ len(self.path_filters)]):
-                    yield source
+            parts = source.parts
+            if not required.issubset(parts):
+                continue
 
-    def __call__(self, state: list[Any], obj: Any = None, max_jobs: Optional[int] = None):
-        output = list(self.filter_paths(state or self.initial_state))
-        for task in self.tasks:
-            if not output:
+            if any(parts[idx:idx + width] == folders
+                   for idx, part in enumerate(parts) if part == folders[0]):
+                yield source
+
+    @property
+    def filters(self) -> list[Any]:
+        """Leading steps of this pipeline which only select input paths.
+        Those can be evaluated for each path individually through their :code:`matches` method.
+
+        Returns:
+            list[Any]: Filter steps
+        """
+        selectors = []
+        for step in _reorder(self.tasks[0].steps) if self.tasks else []:
+            if not _is_selectable(step):
                 break
+            selectors.append(step)
+        return selectors
+
+    @property
+    def plan(self) -> list[Task]:
+        """Tasks as they are run. Filters on file names are moved ahead of steps which only rebase paths
+        (ie. :code:`Relative`) and adjacent filters are fused into a single step.
+
+        Returns:
+            list[Task]: Optimized tasks
+        """
+        return [Task(_fuse(_reorder(task.steps)), max_jobs=task.max_jobs) for task in self.tasks]
+
+    def explain(self) -> str:
+        """
+        Returns:
+            str: Human readable description of the optimized plan
+        """
+        return self._format(self.plan)
+
+    def matches(self, item: Any) -> bool:
+        """Checks whether the item would pass the path filters and leading filter steps.
+
+        Args:
+            item (Any): Input item, usually a path
+
+        Returns:
+            bool: True if the pipeline would select this item
+        """
+        return self.matcher()(item)
+
+    def matcher(self) -> Callable[[Any], bool]:
+        """Same as :code:`matches`, but looks up the filter steps only once.
+        Use this to check many items against the same pipeline.
+
+        Returns:
+            Callable[[Any], bool]: Predicate returning True if the pipeline would select an item
+        """
+        checks = [selector.matches for selector in self.filters]
+        filter_paths = self.filter_paths if self.path_filters else None
+
+        def matches(item: Any) -> bool:
+            if filter_paths is not None and not any(True for _ in filter_paths([item])):
+                return False
+            return all(check(item) for check in checks)
+        return matches
+
+    def narrow(self, state: Iterable[Any]) -> tuple[Iterable[Any], bool]:
+        """Looks up candidates for the path filters and leading filter steps if :code:`state` is indexed,
+        ie. the :code:`Files` list of discovered source files.
+
+        Args:
+            state (Iterable[Any]): Input items
+
+        Returns:
+            tuple[Iterable[Any], bool]: Candidates in input order or :code:`state` itself if no index could be used
+                                        and whether the candidates are exactly the selected items. Otherwise,
+                                        candidates still have to pass the path filters and all filter steps.
+        """
+        if not isinstance(state, Files):
+            return state, False
+
+        # the index does not know the order of folders
+        exact = len(self.path_filters) <= 1
+        found = [state.lookup('part', (folder,)) for folder in self.path_filters]
+        for step in self.filters:
+            if callable(candidates := getattr(step, 'candidates', None)) \
+                    and (positions := candidates(state)) is not None:
+                found.append(positions)
+            else:
+                exact = False
+
+        if not found:
+            return state, False
+
+        return [state[position] for position in sorted(set.intersection(*found))], exact
+
+    def __call__(self, state: list[Any], obj: Any = None, max_jobs: Optional[int] = None,
+                 selected: bool = False) -> list[Any]:
+        """Runs the pipeline.
+
+        Args:
+            state (list[Any]): Input items
+            obj (Any, optional): Object to bind steps to. Defaults to None.
+            max_jobs (Optional[int], optional): Maximum amount of jobs. Defaults to the amount of usable CPUs.
+            selected (bool, optional): Whether :code:`state` has already been filtered, ie. by :code:`partition`.
+                                       Path filters and leading filter steps are skipped if set. Defaults to False.
+
+        Returns:
+            list[Any]: Output of the last step
+        """
+        tasks = self.plan
+        items: Iterable[Any] = state
+        if not selected:
+            items, selected = self.narrow(state or self.initial_state or [])
+
+        if selected:
+            output = list(items)
+            tasks = self._skip_filters(tasks)
+        else:
+            output = list(self.filter_paths(items))
+        shared = current_pool()
 
-            jobs = task.max_jobs or max_jobs or cpu_count()
+        for task in tasks:
+            if not output:
+                break
 
-            if jobs == 1:
-                output = self._run_task(state=output, obj=obj, task=task)
+            if shared is not None:
+                # run on the global job budget
+                jobs = min(task.max_jobs or max_jobs or shared.jobs, shared.jobs)
+                if jobs == 1:
+                    output = self._run_task(state=output, obj=obj, task=task)
+                else:
+                    output = self._run_parallel(shared, jobs, output, obj, task)
                 continue
 
-            # synchronize after every task
-            with Pool(processes=jobs) as pool:
-                _logger.debug("Running with %d jobs", jobs)
-                chunks = [output[i::jobs] for i in range(jobs)]  # partition
-                output = []  # reset buffer
-                for chunk in pool.imap(partial(self._run_task, obj=obj, task=task), chunks):
-                    if not chunk:
-                        continue
+            # share the job budget of the build tool running palgen, if any
+            with reserve(task.max_jobs or max_jobs or cpu_count()) as jobs:
+                if jobs == 1:
+                    output = self._run_task(state=output, obj=obj, task=task)
+                    continue
+
+                with Pool(processes=jobs) as pool:
+                    output = self._run_parallel(pool, jobs, output, obj, task)
+        return output
+
+    @staticmethod
+    def _skip_filters(tasks: list[Task]) -> list[Task]:
+        if not tasks:
+            return tasks
+
+        amount = 0
+        while amount < len(tasks[0].steps) and _is_selectable(tasks[0].steps[amount]):
+            amount += 1
+
+        first = Task(tasks[0].steps[amount:], max_jobs=tasks[0].max_jobs)
+        return [first, *tasks[1:]] if first else tasks[1:]
+
+    def _run_parallel(self, pool: Pool | WorkerPool, jobs: int, state: list[Any], obj: Any, task: Task) -> list[Any]:
+        # synchronize after every task
+        _logger.debug("Running with %d jobs", jobs)
+        if task.steps and callable(split := getattr(task.steps[0], 'split_inputs', None)):
+            # ie. spread large files over all jobs
+            state = list(split(state, jobs))
+        chunks = [state[i::jobs] for i in range(jobs)]  # partition
+        output = []
+        for chunk in pool.imap(partial(self._run_task, obj=obj, task=task), chunks):
+            if not chunk:
+                continue
 
-                    output.extend(chunk)
+            output.extend(chunk)
         return output
 
     run = __call__
 
     def __repr__(self):
+        return self._format(self.tasks)
+
+    def _format(self, tasks: list[Task]) -> str:
         return f"{str(self.initial_state or '[object]')} " + \
+            ''.join(f"/ {folder} " for folder in self.path_filters) + \
             ' |'.join(f"{task.max_jobs or cpu_count()}>> {task}"
-                      for task in self.tasks)
+                      for task in tasks)
 
     __str__ = __repr__
 
@@ -182,3 +380,38 @@ class Pipeline(metaclass=PipelineMeta):
                 return fnc
 
         return partial(fnc, obj)
+
+
+def partition(pipelines: Mapping[str, Pipeline], state: Iterable[Any]) -> dict[str, list[Any]]:
+    """Selects the inputs of multiple pipelines in a single pass over :code:`state`.
+    Pipelines that can look up their candidates in the index of :code:`state` only check those.
+    Run each pipeline on its selection with :code:`selected=True`.
+
+    Args:
+        pipelines (Mapping[str, Pipeline]): Pipelines by key
+        state (Iterable[Any]): Input items, usually paths
+
+    Returns:
+        dict[str, list[Any]]: Selected items for each pipeline, in input order
+    """
+    selected: dict[str, list[Any]] = {key: [] for key in pipelines}
+    checks = []
+    for key, pipeline in pipelines.items():
+        candidates, exact = pipeline.narrow(state)
+        if exact:
+            selected[key] = list(candidates)
+        elif candidates is state:
+            checks.append((pipeline.matcher(), selected[key]))
+        else:
+            matches = pipeline.matcher()
+            selected[key] = [item for item in candidates if matches(item)]
+
+    if not checks:
+        return selected
+
+    for item in state:
+        for matches, bucket in checks:
+            if matches(item):
+                bucket.append(item)
+
+    return selected
@@ -0,0 +1,146 @@
+import logging
+import math
+import os
+from functools import cache
+from pathlib import Path
+from typing import Optional
+
+_logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = Path('/sys/fs/cgroup')
+PROC_CGROUP = Path('/proc/self/cgroup')
+
+
+@cache
+def cpu_count() -> int:
+    """Amount of CPUs this process may actually use.
+
+    Unlike :code:`os.cpu_count()` this honors the scheduler affinity mask
+    as well as cgroup v1 and v2 CPU quotas, which is what container runtimes
+    use to restrict CPU usage.
+
+    Returns:
+        int: Amount of usable CPUs. Always at least 1.
+    """
+    count = _affinity_count() or os.cpu_count() or 1
+
+    if (quota := cgroup_cpu_limit()) is not None and quota < count:
+        _logger.debug("CPU quota restricts jobs from %d to %d", count, quota)
+        count = quota
+
+    return max(count, 1)
+
+
+@cache
+def memory_limit() -> Optional[int]:
+    """Memory limit imposed on this process by cgroup v1 or v2.
+
+    Returns:
+        Optional[int]: Limit in bytes or None if memory usage is not restricted.
+    """
+    return cgroup_memory_limit()
+
+
+def cgroup_cpu_limit(root: Path = CGROUP_ROOT, proc: Path = PROC_CGROUP) -> Optional[int]:
+    """Reads the CPU quota of the cgroup this process belongs to.
+
+    Args:
+        root (Path, optional): Mount point of the cgroup filesystem. Defaults to `/sys/fs/cgroup`.
+        proc (Path, optional): Cgroup membership file. Defaults to `/proc/self/cgroup`.
+
+    Returns:
+        Optional[int]: Quota rounded up to whole CPUs or None if there is no quota.
+    """
+    limits: list[int] = []
+
+    for folder in _cgroup_folders(root, proc, 'cpu'):
+        if (content := _read(folder / 'cpu.max')) is not None:
+            # cgroup v2: "$MAX $PERIOD" where $MAX may be "max"
+            quota, _, period = content.partition(' ')
+            if quota != 'max' and period:
+                limits.append(_to_cpus(int(quota), int(period)))
+
+        elif (cfs_quota := _read(folder / 'cpu.cfs_quota_us')) is not None:
+            # cgroup v1: quota is -1 if unrestricted
+            cfs_period = _read(folder / 'cpu.cfs_period_us')
+            if int(cfs_quota) > 0 and cfs_period:
+                limits.append(_to_cpus(int(cfs_quota), int(cfs_period)))
+
+    return min(limits, default=None)
+
+
+def cgroup_memory_limit(root: Path = CGROUP_ROOT, proc: Path = PROC_CGROUP) -> Optional[int]:
+    """Reads the memory limit of the cgroup this process belongs to.
+
+    Args:
+        root (Path, optional): Mount point of the cgroup filesystem. Defaults to `/sys/fs/cgroup`.
+        proc (Path, optional): Cgroup membership file. Defaults to `/proc/self/cgroup`.
+
+    Returns:
+        Optional[int]: Limit in bytes or None if there is no limit.
+    """
+    limits: list[int] = []
+
+    for folder in _cgroup_folders(root, proc, 'memory'):
+        if (content := _read(folder / 'memory.max')) is not None:
+            # cgroup v2
+            if content != 'max':
+                limits.append(int(content))
+
+        elif (content := _read(folder / 'memory.limit_in_bytes')) is not None:
+            # cgroup v1 reports "unlimited" as a huge page-aligned number
+            if int(content) < 2 ** 62:
+                limits.append(int(content))
+
+    return min(limits, default=None)
+
+
+def _affinity_count() -> Optional[int]:
+    if not hasattr(os, 'sched_getaffinity'):
+        # not available on Windows and macOS
+        return None
+
+    try:
+        return len(os.sched_getaffinity(0))
+    except OSError:
+        return None
+
+
+def _to_cpus(quota: int, period: int) -> int:
+    return max(math.ceil(quota / period), 1)
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(encoding='utf-8').strip()
+    except (OSError, ValueError):
+        return None
+
+
+def _cgroup_folders(root: Path, proc: Path, controller: str) -> list[Path]:
+    """Collects all cgroup folders limits may be set in for the given controller.
+    This includes the process' own cgroup and all of its parents, since limits of
+    parent cgroups apply to their children as well.
+    """
+    if (membership := _read(proc)) is None:
+        return []
+
+    folders: list[Path] = []
+    for line in membership.splitlines():
+        # format is "$ID:$CONTROLLERS:$PATH", v2 has an empty controller list
+        _, controllers, path = line.split(':', 2)
+        if controllers == '':
+            base = root
+        elif controller in controllers.split(','):
+            base = root / controllers
+            if not base.exists():
+                # some distributions mount combined controllers, ie `cpu,cpuacct`
+                base = root / controller
+        else:
+            continue
+
+        relative = Path(path.lstrip('/'))
+        folders.extend(base / parent for parent in [relative, *relative.parents])
+
+    # inside containers the cgroup namespace usually maps the own cgroup to the root
+    return [folder for folder in folders if folder.is_dir()]
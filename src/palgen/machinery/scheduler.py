@@ -0,0 +1,164 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from multiprocessing.pool import Pool
+from typing import Any, Callable, Iterable, Mapping, Optional, TypeVar
+
+from .jobserver import reserve
+
+_logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_active: Optional['WorkerPool'] = None
+
+
+class WorkerPool:
+    __slots__ = 'jobs', 'pool', 'stack'
+
+    def __init__(self, jobs: int) -> None:
+        """Process pool shared by every pipeline run while it is active.
+        This enforces one global job budget even if multiple pipelines run concurrently.
+
+        Args:
+            jobs (int): Maximum amount of worker processes
+        """
+        self.jobs = jobs
+        self.pool: Optional[Pool] = None
+        self.stack = ExitStack()
+
+    def imap(self, fnc: Callable[[Any], T], chunks: Iterable[Any]) -> Iterable[T]:
+        assert self.pool is not None, "Worker pool is not running"
+        return self.pool.imap(fnc, chunks)
+
+    def __enter__(self) -> 'WorkerPool':
+        global _active  # pylint: disable=global-statement
+        assert _active is None, "Another worker pool is already active"
+
+        self.jobs = self.stack.enter_context(reserve(self.jobs))
+        if self.jobs > 1:
+            _logger.debug("Starting %d workers", self.jobs)
+            self.pool = self.stack.enter_context(Pool(processes=self.jobs))
+
+        _active = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        global _active  # pylint: disable=global-statement
+        _active = None
+
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+        self.stack.close()
+
+
+def current_pool() -> Optional[WorkerPool]:
+    """Currently active shared worker pool.
+
+    Returns:
+        Optional[WorkerPool]: The active worker pool or None if pipelines should manage their own pools.
+    """
+    return _active
+
+
+class Scheduler:
+    __slots__ = 'dependencies', 'jobs'
+
+    def __init__(self, dependencies: Mapping[str, Iterable[str]], jobs: int = 1) -> None:
+        """Runs named tasks concurrently while honoring ordering constraints.
+
+        Args:
+            dependencies (Mapping[str, Iterable[str]]): Names of all tasks mapped to the names of tasks
+                                                        which have to finish before they may start.
+                                                        Constraints on unknown tasks are ignored.
+            jobs (int, optional): Maximum amount of tasks to run at once. Defaults to 1.
+
+        Raises:
+            ValueError: Ordering constraints are cyclic.
+        """
+        self.dependencies: dict[str, set[str]] = {}
+        for name, required in dependencies.items():
+            self.dependencies[name] = set()
+
+            for dependency in required:
+                if dependency not in dependencies:
+                    _logger.debug("Ignoring ordering constraint of `%s` on `%s`, it is not scheduled.",
+                                  name, dependency)
+                    continue
+
+                self.dependencies[name].add(dependency)
+
+        self.jobs = max(jobs, 1)
+        self.order()
+
+    def order(self) -> list[str]:
+        """Topological order of all tasks. Ties are broken by insertion order.
+
+        Raises:
+            ValueError: Ordering constraints are cyclic.
+
+        Returns:
+            list[str]: Task names
+        """
+        order: list[str] = []
+        done: set[str] = set()
+        pending = list(self.dependencies)
+
+        while pending:
+            ready = [name for name in pending if self.dependencies[name] <= done]
+            if not ready:
+                raise ValueError(f"Cyclic ordering constraints between {', '.join(pending)}")
+
+            order.extend(ready)
+            done.update(ready)
+            pending = [name for name in pending if name not in done]
+
+        return order
+
+    def run(self, fnc: Callable[[str], T]) -> dict[str, T]:
+        """Calls :code:`fnc` with the name of every task. Tasks without pending
+        dependencies run concurrently on up to :code:`jobs` threads.
+
+        If a task raises no further tasks are started and the exception is re-raised
+        once all running tasks have finished.
+
+        Args:
+            fnc (Callable[[str], T]): Function to run for every task name
+
+        Returns:
+            dict[str, T]: Results of all tasks in topological order
+        """
+        if self.jobs == 1:
+            return {name: fnc(name) for name in self.order()}
+
+        results: dict[str, T] = {}
+        running: dict[Future, str] = {}
+        pending = self.order()
+        failure: Optional[BaseException] = None
+
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix='palgen') as executor:
+            while pending or running:
+                if failure is None:
+                    for name in [name for name in pending if self.dependencies[name] <= results.keys()]:
+                        pending.remove(name)
+                        running[executor.submit(fnc, name)] = name
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    if (exception := future.exception()) is not None:
+                        failure = failure or exception
+                        continue
+
+                    results[name] = future.result()
+
+        if failure is not None:
+            raise failure
+
+        return {name: results[name] for name in self.order()}
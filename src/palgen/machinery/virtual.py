@@ -0,0 +1,127 @@
+import io
+from pathlib import Path
+from typing import IO, Any, Iterable, Optional
+
+# pathlib only supports subclassing the concrete flavour before Python 3.12
+_ConcretePath: Any = type(Path())
+
+
+class VirtualPath(_ConcretePath):
+    """Path whose content is not read from the file system.
+
+    Virtual paths behave like regular paths when filtering and transforming them,
+    however reading them is redirected to :code:`virtual_bytes`, which subclasses must implement.
+    Paths derived through :code:`relative_to` or by prepending a folder refer to the same content.
+    Any other derived path (ie. :code:`parent`) behaves like a regular path.
+    """
+
+    @property
+    def is_virtual(self) -> bool:
+        # attributes are lost whenever pathlib derives a new path
+        return bool(self.__dict__)
+
+    def virtual_bytes(self) -> bytes:
+        raise NotImplementedError
+
+    def read_bytes(self) -> bytes:
+        return self.virtual_bytes() if self.is_virtual else super().read_bytes()
+
+    def read_text(self, encoding: Optional[str] = None, errors: Optional[str] = None) -> str:
+        if not self.is_virtual:
+            text: str = super().read_text(encoding, errors)
+            return text
+        return self.virtual_bytes().decode(encoding or 'utf-8', errors or 'strict')
+
+    def open(self, mode: str = 'r', buffering: int = -1, encoding: Optional[str] = None,
+             errors: Optional[str] = None, newline: Optional[str] = None) -> IO[Any]:
+        if not self.is_virtual:
+            stream: IO[Any] = super().open(mode, buffering, encoding, errors, newline)
+            return stream
+
+        if any(flag in mode for flag in 'wax+'):
+            raise io.UnsupportedOperation(f"{self} is read-only")
+
+        raw = io.BytesIO(self.virtual_bytes())
+        if 'b' in mode:
+            return raw
+        return io.TextIOWrapper(raw, encoding or 'utf-8', errors, newline)
+
+    def exists(self, *args, **kwargs) -> bool:
+        return self.is_virtual or super().exists(*args, **kwargs)
+
+    def is_file(self) -> bool:
+        return self.is_virtual or super().is_file()
+
+    def is_dir(self) -> bool:
+        return not self.is_virtual and super().is_dir()
+
+    def relative_to(self, *other, **kwargs) -> 'VirtualPath':
+        return self._derive(super().relative_to(*other, **kwargs))
+
+    def __rtruediv__(self, key) -> 'VirtualPath':
+        return self._derive(super().__rtruediv__(key))
+
+    def __reduce__(self):
+        # pathlib only pickles the path's parts
+        return _restore, (type(self), str(self), self.__dict__)
+
+    def _derive(self, path: Path) -> 'VirtualPath':
+        derived = path if isinstance(path, type(self)) else _restore(type(self), str(path), {})
+        derived.__dict__.update(self.__dict__)
+        return derived
+
+
+class Generated(VirtualPath):
+    """Output of another extension, held in memory."""
+
+    content: str | bytes
+    # whether the file on disk already had this content
+    unchanged: bool = False
+
+    @classmethod
+    def of(cls, path: Path | str, content: str | bytes) -> 'Generated':
+        """Creates a path to in-memory content.
+
+        Args:
+            path (Path | str): Path the content has been written to
+            content (str | bytes): Generated content
+
+        Returns:
+            Generated: Path object
+        """
+        generated = cls(path)
+        generated.content = content
+        return generated
+
+    def virtual_bytes(self) -> bytes:
+        return self.content.encode('utf-8') if isinstance(self.content, str) else self.content
+
+    def read_text(self, encoding: Optional[str] = None, errors: Optional[str] = None) -> str:
+        if self.is_virtual and isinstance(self.content, str):
+            return self.content
+        return super().read_text(encoding, errors)
+
+
+class Unchanged(_ConcretePath):
+    """Generated file which already had the same content on disk, so it has not been written again.
+    Worker processes report this back to the extension through the type of the path.
+    """
+
+    unchanged = True
+
+
+def count_unchanged(paths: Iterable[Path]) -> int:
+    """
+    Args:
+        paths (Iterable[Path]): Paths yielded by :code:`Extension.write`
+
+    Returns:
+        int: Amount of files which have not been written, since their content did not change
+    """
+    return sum(1 for path in paths if getattr(path, 'unchanged', False))
+
+
+def _restore(cls: type, path: str, attributes: dict[str, Any]) -> Any:
+    restored = cls(path)
+    restored.__dict__.update(attributes)
+    return restored
@@ -1,4 +1,5 @@
 import logging
+import tempfile
 from collections import UserDict
 from functools import cached_property
 from pathlib import Path
@@ -8,8 +9,14 @@ import click
 import toml
 from pydantic import BaseModel, RootModel, ValidationError
 from .application.util import pydantic_to_click
+from .ingest.memo import Memo
 from .loaders import Builtin, ExtensionInfo, Kind, Loader, Manifest, Python
+from .machinery.archive import close_archives
 from .machinery.filesystem import discover, gitignore
+from .machinery.formats import load_toml
+from .machinery.index import Files
+from .machinery.scheduler import Scheduler, WorkerPool
+from .machinery.virtual import count_unchanged
 from .schemas import PalgenSettings, ProjectSettings, RootSettings
 
 _logger = logging.getLogger(__name__)
@@ -145,7 +152,7 @@ class Palgen:
             raise FileNotFoundError("Config file does not exist")
 
         self.root = self.config_path.parent
-        config = toml.load(self.config_path)
+        config = load_toml(self.config_path)
         self.settings = RootSettings.model_validate(config)
 
         self.project = ProjectSettings.model_validate(self.settings['project'])
@@ -164,12 +171,13 @@ class Palgen:
         ignored through .gitignore files.
 
         First access to this can be slow, since it has to walk the entire
-        source tree once. After that it'll be in cache.
+        source tree once. After that it'll be in cache. Pipelines look up their
+        candidates in indexes over this list that are built on first use.
 
         Returns:
             list[Path]: input files
         """
-        files: list[Path] = discover(self.project.sources, gitignore(self.root), jobs=self.options.jobs)
+        files = Files(discover(self.project.sources, gitignore(self.root), jobs=self.options.jobs))
         if not files:
             _logger.warning("No source files detected.")
 
@@ -244,7 +252,10 @@ class Palgen:
         @click.pass_obj
         def wrapper(obj, **kwargs):
             nonlocal key
-            obj.run(key, kwargs)
+            try:
+                obj.run(key, kwargs)
+            finally:
+                close_archives()
 
         if key in self.settings and extension.Settings is not None:
             assert issubclass(extension.Settings, (BaseModel, RootModel))
@@ -266,12 +277,16 @@ class Palgen:
 
         return wrapper
 
-    def run(self, name: str, settings: dict) -> list[Path]:
+    def run(self, name: str, settings: dict,
+            consumed: Optional[list[Path]] = None, handoff: bool = False) -> list[Path]:
         """Runs the specified extension with the given settings.
 
         Args:
             name (str): The name of the extension to run.
             settings (dict): A dictionary of settings to use when running the extension.
+            consumed (Optional[list[Path]], optional): Files generated by other extensions. These are
+                passed to the extension in addition to, or in place of, discovered source files.
+            handoff (bool, optional): Keep generated content in memory for consuming extensions.
 
         Raises:
             SystemExit: Terminates if running the extension threw any uncaught exceptions.
@@ -286,10 +301,17 @@ class Palgen:
         assert info.kind != Kind.BUILTIN, "Running builtins is currently only supported via command line"
 
         extension = info.extension(self.project, self.root, self.output_path, settings)
+        extension.handoff = handoff
         _logger.info("Running extension `%s` with %d jobs", extension.name, self.options.jobs or 1)
 
+        files = self.files
+        if consumed:
+            # generated files replace stale copies discovered on disk
+            replaced = set(consumed)
+            files = Files([file for file in files if file not in replaced] + consumed)
+
         try:
-            return extension.run(self.files, self.options.jobs or 1)
+            return extension.run(files, self.options.jobs or 1)
         except Exception as exception:
             _logger.exception("Running failed: %s: %s", type(exception).__name__, exception)
 
@@ -300,20 +322,60 @@ class Palgen:
 
         This method will try running all extensions enabled in the `palgen.toml` settings file.
         If a extension is not found or isn't runnable it will be skipped.
+
+        Independent extensions run concurrently and share one global job budget.
+        Extensions listing others in their :code:`after` attribute only start once those finished.
+        Files generated by extensions listed in :code:`consumes` are handed over in memory.
+        Files ingested the same way by several extensions are only read and parsed once.
         """
-        generated: list[Path] = []
         #TODO find a better fix for this
         self.extensions # force extensions to be discovered. This flattens self.settings
 
+        enabled: dict[str, dict] = {}
         for name, settings in self.settings.items():
             if name not in self.extensions.runnable:
                 if name not in ('palgen', 'project'):
                     _logger.warning("Extension `%s` not found.", name)
                 continue
 
-            generated.extend(self.run(name, settings) or [])
+            enabled[name] = settings
+
+        after: dict[str, list[str]] = {}
+        consumes: dict[str, list[str]] = {}
+        for name in enabled:
+            extension = self.extensions.runnable[name].extension
+            after[name] = list(getattr(extension, 'after', []))
+            consumes[name] = list(getattr(extension, 'consumes', []))
+
+            for producer in consumes[name]:
+                if producer not in enabled:
+                    _logger.warning("Extension `%s` consumes `%s`, which is not enabled.", name, producer)
+
+        producers = {producer for names in consumes.values() for producer in names}
+        scheduler = Scheduler({name: after[name] + consumes[name] for name in enabled},
+                              jobs=self.options.jobs or 1)
+
+        # walk the source tree before workers are forked
+        self.files # pylint: disable=pointless-statement
+
+        outputs: dict[str, list[Path]] = {}
+
+        def run(name: str) -> list[Path]:
+            consumed = [path for producer in consumes[name] for path in outputs.get(producer, [])]
+            outputs[name] = self.run(name, enabled[name], consumed=consumed, handoff=name in producers)
+            return outputs[name]
+
+        # workers are forked with the memo active, they share parsed files through the temporary folder
+        with tempfile.TemporaryDirectory(prefix='palgen-memo-') as folder, \
+                Memo(folder=Path(folder)), WorkerPool(self.options.jobs or 1):
+            try:
+                results = scheduler.run(run)
+            finally:
+                close_archives()
 
-        _logger.info("Generated %d files.", len(generated))
+        generated = [path for paths in results.values() for path in paths or []]
+        unchanged = count_unchanged(generated)
+        _logger.info("Generated %d files, %d unchanged.", len(generated) - unchanged, unchanged)
 
     def _path_for(self, folder: str | Path) -> Path:
         path = Path(folder)
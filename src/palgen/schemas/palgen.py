@@ -1,9 +1,10 @@
-import os
 from pathlib import Path
 from typing import Annotated, Optional
 
 from pydantic import BaseModel
 
+from ..machinery.resources import cpu_count
+
 
 class ExtensionSettings(BaseModel):
     """ Palgen extension settings """
@@ -24,5 +25,5 @@ class PalgenSettings(BaseModel):
     """ Palgen settings """
 
     extensions: ExtensionSettings = ExtensionSettings()
-    jobs:       Optional[int] = os.cpu_count() or 1
+    jobs:       Optional[int] = cpu_count()
     output:     Annotated[Optional[Path], "Output folder"] = None
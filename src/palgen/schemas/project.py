@@ -9,4 +9,4 @@ class ProjectSettings(BaseModel):
     name:        Annotated[str, "Project name"]
     version:     Annotated[str, "Version number"] = "0"
     description: Annotated[Optional[str], "Project description"] = ""
-    sources:     Annotated[list[Path], "Source folders"] = []
+    sources:     Annotated[list[Path], "Source folders or archives"] = []
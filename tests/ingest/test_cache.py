@@ -0,0 +1,100 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from palgen.ingest import Ingest, Json, Text, Toml, cached
+from palgen.machinery.virtual import Generated
+
+
+@cached
+class CountingToml(Toml):
+    __slots__ = ()
+    parsed: list[Path] = []
+
+    def load(self, file: Path):
+        CountingToml.parsed.append(file)
+        yield from super().load(file)
+
+
+@cached
+class CachedJson(Json):
+    __slots__ = ()
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch) -> Path:
+    folder = tmp_path / 'cache'
+    monkeypatch.setenv('PALGEN_CACHE_DIR', str(folder))
+    CountingToml.parsed.clear()
+    return folder
+
+
+def test_cached(tmp_path: Path, cache_dir: Path):
+    file = tmp_path / 'foo.toml'
+    file.write_text('foo = 1')
+
+    assert list(CountingToml()([file])) == [(file, {'foo': 1})]
+    assert list(CountingToml()([file])) == [(file, {'foo': 1})]
+    assert CountingToml.parsed == [file]
+    assert len(list(cache_dir.rglob('*'))) == 2
+
+    # touched, content hash still matches
+    os.utime(file, ns=(0, 0))
+    assert list(CountingToml()([file])) == [(file, {'foo': 1})]
+    assert CountingToml.parsed == [file]
+
+    file.write_text('foo = 2')
+    assert list(CountingToml()([file])) == [(file, {'foo': 2})]
+    assert CountingToml.parsed == [file, file]
+
+
+def test_cached_options(tmp_path: Path):
+    file = tmp_path / 'foo.json'
+    file.write_bytes(b'{"foo": 1}')
+
+    assert list(CachedJson(backend='json')([file])) == [(file, {'foo': 1})]
+    assert list(CachedJson()([file])) == [(file, {'foo': 1})]
+    assert len({entry.name for entry in (tmp_path / 'cache').rglob('*') if entry.is_file()}) == 2
+
+
+@cached
+class Upper(Text):
+    # options kept in the instance dictionary instead of slots
+
+    def __init__(self, upper: bool) -> None:
+        super().__init__()
+        self.upper = upper
+
+    def load(self, file: Path):
+        for path, text in super().load(file):
+            yield path, text.upper() if self.upper else text
+
+
+def test_cached_dict_options(tmp_path: Path):
+    file = tmp_path / 'foo.txt'
+    file.write_text('abc')
+
+    assert list(Upper(False)([file])) == [(file, 'abc')]
+    assert list(Upper(True)([file])) == [(file, 'ABC')]
+    assert list(Upper(False)([file])) == [(file, 'abc')]
+
+
+def test_virtual(cache_dir: Path):
+    generated = Generated.of('foo.toml', 'foo = 1')
+    assert list(CountingToml()([generated])) == [(generated, {'foo': 1})]
+    assert not cache_dir.exists()
+
+
+def test_unpicklable(tmp_path: Path, cache_dir: Path):
+    @cached
+    class Unpicklable(Ingest):
+        __slots__ = ()
+
+        def load(self, file: Path):
+            yield file, lambda: None
+
+    file = tmp_path / 'foo.bin'
+    file.write_bytes(b'foo')
+    assert [path for path, _ in Unpicklable()([file])] == [file]
+    assert not cache_dir.exists()
@@ -0,0 +1,55 @@
+import bz2
+import gzip
+import lzma
+from pathlib import Path, PurePath
+
+import pytest
+
+from palgen.ingest import Json, JsonLines, Raw, Suffix, Suffixes, Text, Toml
+from palgen.machinery.index import Files
+from palgen.machinery.virtual import Generated
+
+COMPRESSORS = {'': lambda data: data, '.gz': gzip.compress, '.bz2': bz2.compress, '.xz': lzma.compress}
+
+
+@pytest.mark.parametrize('compression', COMPRESSORS)
+def test_loaders(tmp_path: Path, compression: str):
+    def write(name: str, content: bytes) -> Path:
+        path = tmp_path / (name + compression)
+        path.write_bytes(COMPRESSORS[compression](content))
+        return path
+
+    data = write('data.bin', bytes(range(256)))
+    text = write('text.txt', b'foo\r\nbar')
+    json = write('data.json', b'{"foo": [1, 2]}')
+    toml = write('data.toml', b'foo = [1, 2]')
+    lines = write('data.jsonl', b'1\n\n2\n')
+
+    assert list(Raw()([data])) == [(data, bytes(range(256)))]
+    assert [(path, bytes(view)) for path, view in Raw(mmap=True)([data])] == [(data, bytes(range(256)))]
+    assert list(Text()([text])) == [(text, 'foo\nbar')]
+    assert list(Json()([json])) == [(json, {'foo': [1, 2]})]
+    assert list(Toml()([toml])) == [(toml, {'foo': [1, 2]})]
+    assert list(JsonLines(split_size=1)([lines])) == [(lines, 1), (lines, 2)]
+    if compression:
+        # compressed files are never split
+        assert list(JsonLines(split_size=1).split_inputs([lines], 4)) == [lines]
+
+
+def test_virtual():
+    generated = Generated.of('data.json.gz', gzip.compress(b'[1]'))
+    assert list(Json()([generated])) == [(generated, [1])]
+
+
+def test_filter():
+    files = Files(PurePath(name) for name in ('a.json', 'b.json.gz', 'c.toml.xz', 'd.gz', 'e.tar.bz2'))
+
+    for flt, expected in [(Suffix('.json'), ['a.json']),
+                          (Suffix('.json', compressed=True), ['a.json', 'b.json.gz']),
+                          (Suffix(r'^\.(json|toml)$', compressed=True), ['a.json', 'b.json.gz', 'c.toml.xz']),
+                          (Suffix('', compressed=True), ['d.gz']),
+                          (Suffixes('.tar', position=-1, compressed=True), ['e.tar.bz2']),
+                          (Suffixes('.gz', '.xz', '.bz2', compressed=True), [])]:
+        assert [file.name for file in flt(files)] == expected, flt
+        if (candidates := flt.candidates(files)) is not None:
+            assert [files[idx].name for idx in sorted(candidates)] == expected, flt
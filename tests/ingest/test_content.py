@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+
+from palgen.ingest import Contains, Magic, Matches
+from palgen.ingest import content as content_module
+from palgen.machinery.virtual import Generated
+
+
+@pytest.fixture(params=[False, True], ids=['read', 'mmap'])
+def files(request, tmp_path: Path, monkeypatch) -> list[Path]:
+    if request.param:
+        monkeypatch.setattr(content_module, 'MMAP_THRESHOLD', 0)
+
+    contents = {
+        'plain.cpp': b'int main() { return 0; }',
+        'fstring.cpp': b'auto x = f"{foo}";',
+        'image.png': b'\x89PNG\r\n\x1a\n' + b'\0' * 32,
+        'empty.cpp': b'',
+    }
+    for name, content in contents.items():
+        (tmp_path / name).write_bytes(content)
+    return [tmp_path / name for name in contents] + [tmp_path / 'missing.cpp']
+
+
+def names(files):
+    return [file.name for file in files]
+
+
+def test_contains(files: list[Path]):
+    assert names(Contains(b'f"')(files)) == ['fstring.cpp']
+    assert names(Contains(b'f"', b'main')(files)) == ['plain.cpp', 'fstring.cpp']
+    assert names(Contains(b'f"', limit=8)(files)) == []
+    assert names(Contains()(files)) == []
+
+
+def test_matches(files: list[Path]):
+    assert names(Matches(rb'return \d+;')(files)) == ['plain.cpp']
+    assert names(Matches(rb'\bf"', rb'^int')(files)) == ['plain.cpp', 'fstring.cpp']
+    assert names(Matches(rb'^$')(files)) == ['empty.cpp']
+
+
+def test_magic(files: list[Path]):
+    assert names(Magic(b'\x89PNG')(files)) == ['image.png']
+    assert names(Magic(b'PNG', b'nt', offset=1)(files)) == ['plain.cpp', 'image.png']
+
+
+def test_virtual():
+    generated = Generated.of('generated.cpp', 'auto x = f"{foo}";')
+    assert list(Contains(b'f"')([generated])) == [generated]
+    assert list(Magic(b'auto')([generated])) == [generated]
@@ -1,6 +1,6 @@
 from typing import Type
 import pytest
-from palgen.ingest.filter import Filter, Pattern
+from palgen.ingest.filter import And, Filter, Folder, Name, Not, Or, PathInfo, Pattern, Suffix
 from pathlib import Path, PureWindowsPath, PurePosixPath
 import re
 
@@ -96,3 +96,65 @@ def test_pattern(patterns: list[str], unix: bool, expected: list | Type[Identity
 
     for value in expected:
         assert value in result
+
+
+@pytest.mark.parametrize('needles, options, compiled', [
+    (['foo', 'bar'], {}, 0),
+    (['^foo', 'bar$', 'baz'], {}, 1),
+    (['*.h', '*.hpp'], {'unix': True}, 1),
+    ([r'(a)\1', 'b$'], {'regex': True}, 2),
+    (['(?P<x>a)', '(?P<x>b)'], {'regex': True}, 2),
+])
+def test_compiled(needles: list[str], options: dict, compiled: int):
+    filter_instance = Filter(*needles, **options)
+    assert len(filter_instance.patterns) == compiled
+
+    for needle in filter_instance.needles:
+        if isinstance(needle, str):
+            assert filter_instance.match_str(needle) is True
+            assert needle in filter_instance.exact
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('foo.h', True), ('foo.hpp', True), ('foo.cpp', False), ('foo', True), ('xfoo', False), ('abar', True)
+])
+def test_match_combined(value: str, expected: bool):
+    filter_instance = Filter('*.h', '*.hpp', unix=True)
+    other = Filter('foo', '^a', 'bar$')
+    assert (filter_instance.match_str(value) or other.match_str(value)) is expected
+    assert (filter_instance.match_any(['nope', value]) or other.match_any(['nope', value])) is expected
+
+
+def test_compose():
+    paths = [P("src/foo.cpp"), P("src/foo.hpp"), P("src/foo.py"),
+             P("third_party/bar.cpp"), P("src/third_party/baz.hpp"), P("src/main.cpp")]
+
+    selector = (Suffix('.cpp') | Suffix('.hpp')) & ~Folder('third_party')
+    assert isinstance(selector, And)
+    assert list(selector(paths)) == [P("src/foo.cpp"), P("src/foo.hpp"), P("src/main.cpp")]
+
+    selector = selector & ~Name('main.cpp')
+    assert isinstance(selector, And) and len(selector.operands) == 3
+    assert list(selector(paths)) == [P("src/foo.cpp"), P("src/foo.hpp")]
+
+    assert len((Suffix('.a') | Suffix('.b') | Suffix('.c')).operands) == 3
+    assert isinstance(Or(Suffix('.a')) | Suffix('.b'), Or)
+
+    inverted = ~Suffix('.cpp')
+    assert isinstance(inverted, Not)
+    assert isinstance(~inverted, Suffix)
+
+
+def test_compose_shared_view():
+    calls: list[str] = []
+
+    class Counting(PathInfo):
+        @property
+        def suffixes(self):
+            calls.append('suffixes')
+            return super().suffixes
+
+    info = Counting(P("foo/bar.tar.gz"))
+    assert (Suffix('.tar.gz') & ~Suffix('.zip')).matches(info)
+    assert info.suffix == '.tar.gz'
+    assert calls == ['suffixes']
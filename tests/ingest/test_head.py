@@ -0,0 +1,48 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from palgen.ingest import FrontMatter, Head
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    path = tmp_path / 'source.hpp'
+    path.write_bytes('// SPDX: MIT\n// ünïcode\n'.encode() + b'int x;\n' * 10000)
+    return path
+
+
+def test_head(source: Path):
+    assert list(Head(n_lines=1)([source])) == [(source, '// SPDX: MIT\n')]
+    assert list(Head(n_lines=2, encoding=None)([source])) == [(source, '// SPDX: MIT\n// ünïcode\n'.encode())]
+    assert list(Head(n_bytes=5)([source])) == [(source, '// SP')]
+    assert list(Head(n_lines=3, n_bytes=20)([source])) == [(source, '// SPDX: MIT\n// ün')]
+
+    # cut in the middle of `ü`
+    assert list(Head(n_bytes=17)([source])) == [(source, '// SPDX: MIT\n// ')]
+
+    with pytest.raises(ValueError):
+        Head()
+
+
+def test_head_compressed(tmp_path: Path):
+    path = tmp_path / 'source.txt.gz'
+    path.write_bytes(gzip.compress(b'foo\nbar\n'))
+    assert list(Head(n_lines=1)([path])) == [(path, 'foo\n')]
+
+
+def test_front_matter(tmp_path: Path, caplog):
+    contents = {'toml.md': '+++\ntitle = "foo"\r\ntags = []\n+++\n# Foo\n',
+                'empty.md': '+++\n+++\n',
+                'none.md': '# Foo\n+++\nfoo\n+++\n',
+                'longer.md': '++++\nfoo\n++++\n',
+                'unclosed.md': '+++\n' + 'foo = 1\n' * 10}
+    files = []
+    for name, content in contents.items():
+        files.append(tmp_path / name)
+        files[-1].write_text(content, newline='')
+
+    assert [(path.name, block) for path, block in FrontMatter('+++', limit=32)(files)] == \
+        [('toml.md', 'title = "foo"\r\ntags = []\n'), ('empty.md', '')]
+    assert 'unclosed.md' in caplog.text
@@ -0,0 +1,106 @@
+import gc
+import random
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from pydantic import BaseModel
+
+from palgen import Extension
+from palgen.ingest import Ingest, Json, Raw, Text
+from palgen.ingest import content as content_module
+from palgen.machinery.virtual import Generated
+
+
+@pytest.fixture
+def files(tmp_path: Path, monkeypatch) -> list[Path]:
+    monkeypatch.setattr(content_module, 'MMAP_THRESHOLD', 16)
+    contents = {'small.bin': b'tiny', 'large.bin': bytes(range(256)) * 4, 'empty.bin': b''}
+    for name, content in contents.items():
+        (tmp_path / name).write_bytes(content)
+    return [tmp_path / name for name in contents]
+
+
+def test_raw(files: list[Path]):
+    assert list(Raw()(files)) == [(file, file.read_bytes()) for file in files]
+
+
+def test_raw_mmap(files: list[Path]):
+    kept = list(Raw(mmap=True)(files))
+    gc.collect()
+
+    for file, view in kept:
+        assert isinstance(view, memoryview)
+        assert view.readonly
+        assert view == file.read_bytes()
+
+    generated = Generated.of('foo.bin', b'generated')
+    assert [(path, bytes(view)) for path, view in Raw(mmap=True)([generated])] == [(generated, b'generated')]
+
+
+def test_raw_mmap_release(files: list[Path]):
+    views = []
+    for _, view in Raw(mmap=True)(files):
+        views.append(view.obj)
+        del view
+
+    # the mapping of the large file has been closed once it was no longer referenced
+    assert views[1].closed
+
+
+class Slow(Ingest):
+    __slots__ = ()
+
+    def load(self, file: Path):
+        time.sleep(random.uniform(0, 0.01))
+        if file.name == 'broken':
+            raise ValueError(file)
+        yield file, threading.current_thread().name
+
+
+@pytest.mark.parametrize('prefetch', [0, 1, 4])
+def test_prefetch(prefetch: int):
+    files = [Path(str(idx)) for idx in range(32)]
+    result = list(Slow(prefetch)(files))
+
+    assert [file for file, _ in result] == files
+    assert all(thread.startswith('palgen-prefetch') == bool(prefetch) for _, thread in result)
+
+    with pytest.raises(ValueError):
+        list(Slow(prefetch)([*files[:3], Path('broken'), *files[3:]]))
+
+
+def test_prefetch_text(files: list[Path]):
+    assert list(Text('latin-1', prefetch=2)(files)) == list(Text('latin-1')(files))
+    assert [content for _, content in Raw(mmap=True, prefetch=2)(files)] == [file.read_bytes() for file in files]
+
+
+class Descriptor(BaseModel):
+    name: str
+    size: int
+
+
+class Descriptors(Extension):
+    Schema = Descriptor
+
+
+@pytest.mark.parametrize('backend', [None, 'json', 'orjson', 'msgspec'])
+def test_json(tmp_path: Path, backend):
+    if backend is not None and backend != 'json':
+        pytest.importorskip(backend)
+
+    (tmp_path / 'foo.json').write_bytes(b'{"name": "foo", "size": 4}')
+    (tmp_path / 'bar.json').write_bytes(b'{"name": "bar", "size": "large"}')
+    files = [tmp_path / 'foo.json', tmp_path / 'bar.json']
+
+    assert list(Json(backend=backend)(files)) == [(files[0], {'name': 'foo', 'size': 4}),
+                                                  (files[1], {'name': 'bar', 'size': 'large'})]
+
+    validated = list(Json(schema=Descriptor)(files))
+    assert validated == [(files[0], Descriptor(name='foo', size=4))]
+
+    extension = Descriptors.__new__(Descriptors)
+    assert list(extension.validate(validated)) == validated
+    assert validated[0][1] is list(extension.validate(validated))[0][1]
@@ -0,0 +1,131 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from palgen.ingest import Json, Lines, Raw, Text, Toml
+from palgen.ingest.memo import Memo, current_memo
+from palgen.machinery.virtual import Generated
+
+
+class CountingToml(Toml):
+    __slots__ = ()
+    parsed: list[Path] = []
+
+    def load(self, file: Path):
+        CountingToml.parsed.append(file)
+        yield from super().load(file)
+
+
+@pytest.fixture
+def file(tmp_path: Path) -> Path:
+    CountingToml.parsed.clear()
+    path = tmp_path / 'foo.toml'
+    path.write_text('foo = [1, 2]')
+    return path
+
+
+def test_shared(file: Path):
+    with Memo() as memo:
+        assert current_memo() is memo
+        first = list(CountingToml()([file]))
+        second = list(CountingToml(prefetch=2)([file]))
+
+    assert current_memo() is None
+    assert first == second == [(file, {'foo': [1, 2]})]
+    assert CountingToml.parsed == [file]
+    assert (memo.hits, memo.misses) == (1, 1)
+
+    # every reader gets its own copy
+    first[0][1]['foo'].append(3)
+    assert second[0][1] == {'foo': [1, 2]}
+
+
+def test_key(file: Path):
+    with Memo() as memo:
+        list(Text()([file]))
+        list(Text(encoding='latin-1')([file]))
+        list(Raw()([file]))
+        assert list(Text()([file])) == [(file, 'foo = [1, 2]')]
+
+        file.write_text('foo = [1, 2, 3]')
+        os.utime(file, ns=(0, 0))
+        assert list(Text()([file])) == [(file, 'foo = [1, 2, 3]')]
+
+    assert (memo.hits, memo.misses) == (1, 4)
+
+
+def test_skipped(file: Path, tmp_path: Path):
+    generated = Generated.of(file, 'foo = 1')
+    lines = tmp_path / 'foo.txt'
+    lines.write_text('foo\nbar\n')
+
+    with Memo() as memo:
+        assert list(CountingToml()([generated])) == [(generated, {'foo': 1})]
+        assert list(Raw(mmap=True)([file])) == list(Raw(mmap=True)([file]))
+        list(Lines()([lines]))
+
+    assert (memo.hits, memo.misses) == (0, 0)
+    assert not memo.entries
+
+
+def test_capacity(tmp_path: Path):
+    files = []
+    for idx in range(4):
+        files.append(tmp_path / f'{idx}.json')
+        files[-1].write_bytes(b'[' + b'0, ' * 100 + b'0]')
+
+    with Memo(capacity=700) as memo:
+        list(Json()(files))
+        assert 0 < memo.used <= 700
+        assert len(memo.entries) < len(files)
+
+        # most recently used entries are kept
+        list(Json()(files[-1:]))
+        assert memo.hits == 1
+
+
+class Upper(Text):
+    # options kept in the instance dictionary instead of slots
+
+    def __init__(self, upper: bool) -> None:
+        super().__init__()
+        self.upper = upper
+
+    def load(self, file: Path):
+        for path, text in super().load(file):
+            yield path, text.upper() if self.upper else text
+
+
+def test_dict_options(tmp_path: Path):
+    file = tmp_path / 'foo.txt'
+    file.write_text('abc')
+
+    with Memo():
+        assert list(Upper(False)([file])) == [(file, 'abc')]
+        assert list(Upper(True)([file])) == [(file, 'ABC')]
+        assert list(Upper(False)([file])) == [(file, 'abc')]
+
+
+def test_shared_folder(file: Path, tmp_path: Path):
+    folder = tmp_path / 'memo'
+    folder.mkdir()
+
+    # separate memos stand in for separate worker processes
+    with Memo(folder=folder) as first:
+        assert list(CountingToml()([file])) == [(file, {'foo': [1, 2]})]
+
+    with Memo(folder=folder) as second:
+        result = list(CountingToml()([file]))
+        result[0][1]['foo'].append(3)
+        assert list(CountingToml()([file])) == [(file, {'foo': [1, 2]})]
+
+    assert CountingToml.parsed == [file]
+    assert (first.hits, first.misses) == (0, 1)
+    assert (second.hits, second.misses) == (2, 0)
+
+    file.write_text('foo = 1')
+    os.utime(file, ns=(0, 0))
+    with Memo(folder=folder):
+        assert list(CountingToml()([file])) == [(file, {'foo': 1})]
+    assert len(CountingToml.parsed) == 2
@@ -0,0 +1,66 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from palgen.ingest import Absolute, Relative
+from palgen.machinery.virtual import Generated
+
+ROOT = Path('/project')
+
+
+@pytest.fixture
+def extension() -> SimpleNamespace:
+    return SimpleNamespace(root_path=ROOT)
+
+
+def test_relative(extension: SimpleNamespace):
+    files = [ROOT / 'src' / 'foo.cpp', ROOT / 'foo.hpp', ROOT, ROOT / 'a' / 'b' / 'c.tar.gz']
+    relative = list(Relative(extension, files))
+
+    assert relative == [file.relative_to(ROOT) for file in files]
+    assert [str(path) for path in relative] == ['src/foo.cpp', 'foo.hpp', '.', 'a/b/c.tar.gz']
+    assert [path.suffixes for path in relative] == [['.cpp'], ['.hpp'], [], ['.tar', '.gz']]
+    assert relative[0] / 'bar' == Path('src/foo.cpp/bar')
+    assert relative[0].with_suffix('.hpp') == Path('src/foo.hpp')
+    assert relative[0].parent == Path('src')
+    assert hash(relative[0]) == hash(Path('src/foo.cpp'))
+
+    with pytest.raises(ValueError):
+        list(Relative(extension, [Path('/other/foo.cpp')]))
+
+    generated = Generated.of(ROOT / 'build' / 'foo.hpp', 'content')
+    derived, = Relative(extension, [generated])
+    assert isinstance(derived, Generated) and derived.read_text() == 'content'
+
+
+def test_absolute(extension: SimpleNamespace):
+    files = [Path('src/foo.cpp'), Path('.'), Path('/other/foo.cpp')]
+    absolute = list(Absolute(extension, files))
+
+    assert absolute == [ROOT / file for file in files]
+    assert [str(path) for path in absolute] == ['/project/src/foo.cpp', '/project', '/other/foo.cpp']
+    assert absolute[0].is_absolute() and absolute[0].name == 'foo.cpp'
+
+    generated = Generated.of('build/foo.hpp', 'content')
+    derived, = Absolute(extension, [generated])
+    assert isinstance(derived, Generated) and derived.read_text() == 'content'
+
+    assert list(Absolute(extension, Relative(extension, [ROOT / 'src' / 'foo.cpp']))) == [ROOT / 'src' / 'foo.cpp']
+
+
+def describe(path: Path) -> tuple:
+    return (str(path), repr(path), path.parts, path.drive, path.root, path.anchor, path.name, path.stem,
+            path.suffixes, str(path.parent), path.as_posix(), hash(path), path.is_absolute(), path.__reduce__())
+
+
+@pytest.mark.parametrize('relative', ['foo.cpp', 'src/foo.cpp', 'a/b/c.tar.gz', '.hidden', 'a b/ü.txt'])
+def test_fast_path(extension: SimpleNamespace, relative: str):
+    # the fast path relies on private pathlib API, its paths must not be distinguishable from public ones
+    derived, = Relative(extension, [ROOT / relative])
+    assert describe(derived) == describe((ROOT / relative).relative_to(ROOT))
+    assert derived == Path(relative)
+
+    restored, = Absolute(extension, [derived])
+    assert describe(restored) == describe(ROOT / Path(relative))
+    assert restored == ROOT / relative
@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest
+
+from palgen.ingest import Csv, JsonLines, Lines, Span
+from palgen.machinery import Pipeline
+from palgen.machinery.virtual import Generated
+
+
+@pytest.fixture
+def records(tmp_path: Path) -> Path:
+    path = tmp_path / 'records.jsonl'
+    path.write_text(''.join(f'{{"id": {idx}, "name": "record{idx}"}}\n' for idx in range(1000)))
+    return path
+
+
+def test_lines(tmp_path: Path):
+    path = tmp_path / 'lines.txt'
+    path.write_bytes(b'foo\r\nbar\n\nbaz')
+    assert list(Lines()([path])) == [(path, 'foo'), (path, 'bar'), (path, ''), (path, 'baz')]
+
+    generated = Generated.of('generated.txt', 'a\nb\n')
+    assert list(Lines()([generated])) == [(generated, 'a'), (generated, 'b')]
+
+
+def test_json_lines(records: Path):
+    result = list(JsonLines()([records]))
+    assert len(result) == 1000
+    assert result[42] == (records, {'id': 42, 'name': 'record42'})
+
+
+def test_csv(tmp_path: Path):
+    path = tmp_path / 'table.csv'
+    path.write_text('name;size\nfoo;1\n"b;ar";2\n')
+    assert [row for _, row in Csv(delimiter=';')([path])] == [{'name': 'foo', 'size': '1'},
+                                                               {'name': 'b;ar', 'size': '2'}]
+
+    spans = list(Csv(delimiter=';', split_size=1).split_inputs([path], 2))
+    assert [row['name'] for _, row in Csv(delimiter=';')(spans)] == ['foo', 'b;ar']
+
+
+@pytest.mark.parametrize('split_size, parts', [(1, 1), (1, 3), (4096, 2), (1 << 20, 8)])
+def test_split(records: Path, split_size: int, parts: int):
+    ingest = JsonLines(split_size=split_size)
+    spans = list(ingest.split_inputs([records], parts))
+    size = records.stat().st_size
+
+    if max(split_size, -(-size // parts)) >= size:
+        assert spans == [records]
+        return
+
+    assert all(isinstance(span, Span) for span in spans)
+    assert spans[0].start == 0 and spans[-1].end == size
+    assert all(left.end == right.start for left, right in zip(spans, spans[1:]))
+    assert list(ingest(spans)) == list(ingest([records]))
+
+
+def double(data):
+    for path, record in data:
+        yield path, record['id'] * 2
+
+
+def test_pipeline(records: Path, tmp_path: Path):
+    other = tmp_path / 'other.jsonl'
+    other.write_text('{"id": 1000}\n')
+
+    pipeline = Pipeline >> JsonLines(split_size=1024) >> double
+    assert len(pipeline.tasks) == 1
+
+    result = pipeline([records, other], max_jobs=4)
+    assert sorted(value for _, value in result) == [idx * 2 for idx in range(1001)]
+    assert {path for path, _ in result} == {records, other}
@@ -0,0 +1,67 @@
+import sys
+
+from palgen.ingest import CompressKeys, ExpandKeys
+
+
+def reference(data, namespace=None, separator='.'):
+    # the former recursive implementation
+    if namespace is None:
+        namespace = []
+
+    if not isinstance(data, dict):
+        return
+
+    if any(not isinstance(v, dict) for v in data.values()):
+        yield separator.join(namespace[:-1]), namespace[-1], data
+        return
+
+    for key, value in data.items():
+        yield from reference(value, namespace + [key], separator)
+
+
+DATA = {
+    'error': {
+        'io': {'code': 1, 'message': 'I/O'},
+        'net': {'timeout': {'code': 2}, 'refused': {'code': 3, 'retry': {'count': 3}}},
+        'empty': {},
+    },
+    'settings': {'flat': {'value': [1, 2], 'nested': {'kept': True}}},
+}
+
+
+def test_compress():
+    assert list(CompressKeys(DATA)) == list(reference(DATA)) == [
+        ('error', 'io', {'code': 1, 'message': 'I/O'}),
+        ('error.net', 'timeout', {'code': 2}),
+        ('error.net', 'refused', {'code': 3, 'retry': {'count': 3}}),
+        ('settings', 'flat', {'value': [1, 2], 'nested': {'kept': True}}),
+    ]
+
+    assert list(CompressKeys(DATA, ['root', 'sub'], '::')) == list(reference(DATA, ['root', 'sub'], '::'))
+    assert list(CompressKeys(DATA['error']['io'], ['error', 'io'])) == [('error', 'io', DATA['error']['io'])]
+    assert list(CompressKeys({'value': 1})) == [('', '', {'value': 1})]
+    assert not list(CompressKeys([1, 2]))
+
+
+def test_deep_and_wide():
+    depth = sys.getrecursionlimit() * 2
+    deep: dict = {'value': 1}
+    for _ in range(depth):
+        deep = {'a': deep}
+
+    (namespace, key, table), = CompressKeys(deep)
+    assert namespace == '.'.join(['a'] * (depth - 1)) and key == 'a' and table == {'value': 1}
+
+    wide = {f'table{idx}': {'value': idx} for idx in range(10000)}
+    assert [key for _, key, _ in CompressKeys(wide)] == list(wide)
+
+
+def test_expand():
+    compressed = list(CompressKeys(DATA))
+    expanded = ExpandKeys(compressed)
+
+    assert expanded == {'error': {'io': DATA['error']['io'], 'net': DATA['error']['net']},
+                        'settings': DATA['settings']}
+    assert list(CompressKeys(expanded)) == compressed
+    assert ExpandKeys(CompressKeys({'value': 1})) == {'value': 1}
+    assert ExpandKeys(CompressKeys(DATA, separator='/'), separator='/') == expanded
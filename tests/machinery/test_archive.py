@@ -0,0 +1,86 @@
+import gzip
+import io
+import pickle
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from palgen.ingest import Json, JsonLines, Raw, Suffix, Text
+from palgen.machinery import archive as archive_module
+from palgen.machinery.archive import Member, close_archives, is_archive, members
+from palgen.machinery.filesystem import discover
+
+CONTENT = {'data/foo.json': b'{"foo": 1}', 'data/bar.txt': b'bar', 'lines.jsonl.gz': gzip.compress(b'1\n2\n')}
+
+
+def write_zip(path: Path, files: dict[str, bytes] = CONTENT) -> Path:
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('data/', b'')
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return path
+
+
+def write_tar(path: Path, files: dict[str, bytes] = CONTENT) -> Path:
+    with tarfile.open(path, 'w:gz') as archive:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    return path
+
+
+@pytest.fixture(params=[('pack.zip', write_zip), ('pack.tar.gz', write_tar)])
+def archive(request, tmp_path: Path) -> Path:
+    name, write = request.param
+    return write(tmp_path / name)
+
+
+def test_members(archive: Path):
+    assert is_archive(archive)
+    assert not is_archive(archive.parent)
+
+    listed = members(archive)
+    assert sorted(listed) == sorted(archive / name for name in CONTENT)
+    assert all(member.is_virtual and member.is_file() for member in listed)
+    assert {member.member: member.read_bytes() for member in listed} == CONTENT
+
+    restored = pickle.loads(pickle.dumps(listed[0]))
+    assert isinstance(restored, Member)
+    assert restored.read_bytes() == listed[0].read_bytes()
+
+
+def test_ingest(archive: Path):
+    files = discover([archive])
+    by_name = {file.name: file for file in files}
+
+    assert list(Json()(Suffix('.json')(files))) == [(by_name['foo.json'], {'foo': 1})]
+    assert list(Text()([by_name['bar.txt']])) == [(by_name['bar.txt'], 'bar')]
+    assert list(Raw(mmap=True)([by_name['bar.txt']]))[0][1] == b'bar'
+    assert [record for _, record in JsonLines()([by_name['lines.jsonl.gz']])] == [1, 2]
+
+    relative = by_name['foo.json'].relative_to(archive)
+    assert str(relative) == 'data/foo.json'
+    assert relative.read_bytes() == CONTENT['data/foo.json']
+
+
+@pytest.mark.parametrize('name, write', [('pack.zip', write_zip), ('pack.tar.gz', write_tar)])
+def test_unsafe_members(tmp_path: Path, name: str, write, caplog):
+    unsafe = {'/etc/passwd': b'x', '../escape.txt': b'x', 'data/../../escape.txt': b'x', 'C:/escape.txt': b'x'}
+    archive = write(tmp_path / name, {**CONTENT, **unsafe})
+
+    assert sorted(member.member for member in members(archive)) == sorted(CONTENT)
+    assert all(name in caplog.text for name in unsafe)
+
+
+def test_close(archive: Path):
+    listed = members(archive)
+    assert archive_module._archives  # pylint: disable=protected-access
+
+    close_archives()
+    assert not archive_module._archives  # pylint: disable=protected-access
+
+    # reopened on demand
+    assert listed[0].read_bytes() == CONTENT[listed[0].member]
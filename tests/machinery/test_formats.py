@@ -0,0 +1,45 @@
+import logging
+from pathlib import Path
+
+import pytest
+
+from palgen.ingest import Toml
+from palgen.machinery.formats import TomlError, load_toml, loads_toml, toml_backend
+
+DOCUMENT = b'[project]\nname = "foo"\nsources = ["src", "include"]\n\n[palgen.extensions]\nfolders = []\n'
+
+
+def test_default_backend():
+    assert toml_backend().name in ('tomllib', 'tomli')
+
+
+@pytest.mark.parametrize('backend', ['tomllib', 'toml'])
+def test_loads(backend: str):
+    pytest.importorskip(backend)
+
+    expected = {'project': {'name': 'foo', 'sources': ['src', 'include']}, 'palgen': {'extensions': {'folders': []}}}
+    assert loads_toml(DOCUMENT, backend) == expected
+    assert loads_toml(DOCUMENT.decode(), backend) == expected
+
+    with pytest.raises(TomlError) as exc:
+        loads_toml(b'[project\n', backend)
+    assert exc.value.msg
+
+    with pytest.raises(TomlError):
+        loads_toml(b'name = "\xff"', backend)
+
+
+def test_missing_backend():
+    with pytest.raises(ImportError):
+        toml_backend('no_such_toml_parser')
+
+
+def test_ingest(tmp_path: Path, caplog):
+    (tmp_path / 'valid.toml').write_bytes(DOCUMENT)
+    (tmp_path / 'broken.toml').write_bytes(b'[project\n')
+
+    with caplog.at_level(logging.WARNING):
+        result = list(Toml()([tmp_path / 'broken.toml', tmp_path / 'valid.toml']))
+
+    assert result == [(tmp_path / 'valid.toml', load_toml(tmp_path / 'valid.toml'))]
+    assert "Could not load" in caplog.text
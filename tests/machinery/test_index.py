@@ -0,0 +1,98 @@
+import pickle
+from pathlib import Path
+
+from palgen.ingest import Filter, Folder, Name, Stem, Suffix
+from palgen.machinery import Pipeline
+from palgen.machinery.index import Files
+from palgen.machinery.pipeline import partition
+
+FILES = [Path('/src/foo.c'), Path('/src/foo.h'), Path('/inc/bar.h'), Path('/src/baz.tar.gz'),
+         Path('/src/third_party/foo.c')]
+
+
+def passthrough(data):
+    yield from data
+
+
+def test_lookup():
+    files = Files(FILES)
+    assert not files.indexes
+
+    assert files.lookup('suffix', ['.h', '.tar.gz']) == {1, 2, 3}
+    assert files.lookup('name', ['foo.c']) == {0, 4}
+    assert files.lookup('stem', ['baz.tar']) == {3}
+    assert files.lookup('part', ['src', 'missing']) == {0, 1, 3, 4}
+    assert set(files.indexes) == {'suffix', 'name', 'stem', 'part'}
+
+    restored = pickle.loads(pickle.dumps(files))
+    assert isinstance(restored, Files) and restored == files and not restored.indexes
+
+
+def test_list():
+    files = Files(FILES)
+    assert files.lookup('name', ['foo.h']) == {1}
+
+    # still a regular list
+    assert files.index(FILES[1]) == 1
+
+    files.insert(0, Path('/src/qux.h'))
+    assert not files.indexes
+    assert files.lookup('name', ['foo.h']) == {2}
+
+    del files[:3]
+    files += [Path('/src/foo.h')]
+    assert files.lookup('name', ['foo.h']) == {len(files) - 1}
+
+
+def test_select():
+    calls: list[str] = []
+
+    def is_header(suffix: str) -> bool:
+        calls.append(suffix)
+        return suffix.startswith('.h')
+
+    files = Files(FILES)
+    assert files.select('suffix', is_header) == {1, 2}
+    assert sorted(calls) == ['.c', '.h', '.tar.gz']
+    assert files.select('part', lambda part: part.endswith('party')) == {4}
+
+
+def test_candidates():
+    files = Files(FILES)
+    assert Suffix('.c').candidates(files) == {0, 4}
+    assert Suffix(r'^\.c$').candidates(files) == {0, 4}
+    assert Folder('^third').candidates(files) == {4}
+    assert (Suffix('.c') & ~Folder('third_party')).candidates(files) == {0}
+    assert (Name('bar.h') | Stem('baz.tar')).candidates(files) == {2, 3}
+    assert (Name('bar.h') | ~Stem('baz.tar')).candidates(files) == {0, 1, 2, 4}
+    assert (Name('bar.h') & Filter('/inc/bar.h')).candidates(files) is None
+
+
+def test_narrow():
+    files = Files(FILES)
+    pipeline = Pipeline / 'src' >> Suffix('.c', '.h') >> Name('foo.c', 'foo.h') >> passthrough
+
+    assert pipeline.narrow(FILES) == (FILES, False)
+    assert pipeline.narrow(files) == ([Path('/src/foo.c'), Path('/src/foo.h'), Path('/src/third_party/foo.c')], True)
+    assert pipeline(files) == pipeline(list(FILES))
+
+    nested = Pipeline / 'src' / 'third_party' >> Filter('/src/third_party/foo.c') >> passthrough
+    assert nested.narrow(files) == ([Path('/src/third_party/foo.c')], False)
+    assert nested(files) == [Path('/src/third_party/foo.c')]
+
+    unindexed = Pipeline >> passthrough
+    assert unindexed.narrow(files) == (files, False)
+
+
+def test_partition():
+    pipelines = {
+        'sources': Pipeline >> (Suffix('.c') & ~Folder('third_party')) >> passthrough,
+        'headers': Pipeline / 'src' >> Suffix('.h') >> passthrough,
+        'all':     Pipeline >> passthrough,
+    }
+
+    assert partition(pipelines, Files(FILES)) == partition(pipelines, FILES) == {
+        'sources': [Path('/src/foo.c')],
+        'headers': [Path('/src/foo.h')],
+        'all':     FILES,
+    }
@@ -0,0 +1,136 @@
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from palgen.machinery import jobserver as jobserver_module
+from palgen.machinery.jobserver import Jobserver, parse_makeflags, reserve
+
+posix_only = pytest.mark.skipif(os.name != 'posix', reason="jobserver is only supported on POSIX systems")
+
+
+@pytest.mark.parametrize('makeflags, expected', [
+    ('', None),
+    ('-j4', None),
+    (' -j4 --jobserver-auth=3,4', '3,4'),
+    ('-j --jobserver-fds=5,6 -j', '5,6'),
+    ('-j8 --jobserver-auth=fifo:/tmp/GMfifo1234', 'fifo:/tmp/GMfifo1234'),
+    ('--jobserver-auth=3,4 --jobserver-auth=fifo:/tmp/x -- CC=--jobserver-auth=7,8', 'fifo:/tmp/x'),
+])
+def test_parse_makeflags(makeflags: str, expected):
+    assert parse_makeflags(makeflags) == expected
+
+
+@posix_only
+def test_pipe():
+    reader, writer = os.pipe()
+    os.write(writer, b'+++')
+
+    client = Jobserver.from_environment({'MAKEFLAGS': f'-j4 --jobserver-auth={reader},{writer}'})
+    assert client is not None
+    assert client.fds == (reader, writer)
+
+    assert client.acquire(5) == 3
+    assert client.acquire(1) == 0
+
+    client.release(2)
+    assert client.acquire(5) == 2
+    client.release()
+    assert not client.tokens
+
+    os.set_blocking(reader, False)
+    assert os.read(reader, 16) == b'+++'
+
+
+@posix_only
+def test_fifo(tmp_path: Path):
+    fifo = tmp_path / 'fifo'
+    os.mkfifo(fifo)
+
+    # keep the fifo open like make does
+    server = os.open(fifo, os.O_RDWR)
+    os.write(server, b'ab')
+
+    client = Jobserver.from_environment({'MAKEFLAGS': f'--jobserver-auth=fifo:{fifo}'})
+    assert client is not None
+    assert client.fds == ()
+    assert client.acquire(3) == 2
+    assert sorted(client.tokens) == [b'a', b'b']
+    client.release()
+
+
+@posix_only
+def test_invalid():
+    assert Jobserver.from_environment({'MAKEFLAGS': ''}) is None
+    assert Jobserver.from_environment({'MAKEFLAGS': '--jobserver-auth=-2,-2'}) is None
+
+    reader, writer = os.pipe()
+    os.close(reader)
+    os.close(writer)
+    assert Jobserver.from_environment({'MAKEFLAGS': f'--jobserver-auth={reader},{writer}'}) is None
+
+
+@posix_only
+def test_not_a_pipe(tmp_path: Path):
+    with open(tmp_path / 'file', 'w+b') as file:
+        fd = file.fileno()
+        assert Jobserver.from_environment({'MAKEFLAGS': f'--jobserver-auth={fd},{fd}'}) is None
+
+
+@posix_only
+def test_blocking_only(monkeypatch):
+    # without a private non-blocking descriptor reading tokens could block forever
+    monkeypatch.setattr(jobserver_module, '_reopen_nonblocking', lambda reader: None)
+
+    reader, writer = os.pipe()
+    try:
+        assert Jobserver.from_environment({'MAKEFLAGS': f'--jobserver-auth={reader},{writer}'}) is None
+    finally:
+        os.close(reader)
+        os.close(writer)
+
+
+@posix_only
+def test_reserve(monkeypatch):
+    reader, writer = os.pipe()
+    os.write(writer, b'++')
+    client = Jobserver.from_environment({'MAKEFLAGS': f'--jobserver-auth={reader},{writer}'})
+    monkeypatch.setattr(jobserver_module, 'jobserver', lambda: client)
+
+    with reserve(8) as jobs:
+        assert jobs == 3
+        with reserve(4) as nested:
+            assert nested == 1
+
+    assert not client.tokens
+    with reserve(2) as jobs:
+        assert jobs == 2
+
+
+def test_reserve_without_jobserver(monkeypatch):
+    monkeypatch.setattr(jobserver_module, 'jobserver', lambda: None)
+
+    with reserve(8) as jobs:
+        assert jobs == 8
+
+    with reserve(0) as jobs:
+        assert jobs == 1
+
+
+@posix_only
+@pytest.mark.skipif(shutil.which('make') is None, reason="GNU make is not installed")
+def test_make(tmp_path: Path):
+    script = tmp_path / 'probe.py'
+    script.write_text("from palgen.machinery.jobserver import reserve\n"
+                      "with reserve(16) as jobs:\n"
+                      "    print(jobs)\n")
+
+    makefile = tmp_path / 'Makefile'
+    makefile.write_text(f"all:\n\t+@{sys.executable} {script}\n")
+
+    result = subprocess.run(['make', '-s', '-j4', '-f', str(makefile)],
+                            cwd=tmp_path, capture_output=True, text=True, check=True)
+    assert int(result.stdout.strip().splitlines()[-1]) == 4
@@ -171,3 +171,108 @@ def test_identity(mocker, pipeline, meta_count, ctor_count, call_count):
     assert result == {0, 1, 2, 3, 4}
     assert ctor.call_count == ctor_count
     assert call.call_count == call_count
+
+
+def test_partition():
+    from pathlib import Path as P
+    from palgen.ingest import Name, Suffix
+    from palgen.machinery.pipeline import partition
+
+    files = [P('/src/foo.c'), P('/src/foo.h'), P('/inc/bar.h'), P('/src/baz.txt')]
+    pipelines = {
+        'sources': Pipeline >> Suffix('.c') >> passthrough,
+        'headers': Pipeline / 'src' >> Suffix('.h') >> passthrough,
+        'foo':     Pipeline >> Name('foo.c', 'foo.h') >> Suffix('.h') >> passthrough,
+        'all':     Pipeline >> passthrough,
+    }
+
+    assert [len(pipeline.filters) for pipeline in pipelines.values()] == [1, 1, 2, 0]
+
+    selected = partition(pipelines, files)
+    assert selected == {
+        'sources': [P('/src/foo.c')],
+        'headers': [P('/src/foo.h')],
+        'foo':     [P('/src/foo.h')],
+        'all':     files,
+    }
+
+    for key, pipeline in pipelines.items():
+        assert pipeline(selected[key], selected=True) == pipeline(files)
+
+
+def test_filter_paths():
+    from pathlib import Path as P
+
+    files = [P('/src/a/src/foo.c'), P('/src/a/b.c'), P('/a/src/b.c'), P('/b/a.c')]
+    assert list((Pipeline / 'src').filter_paths(files)) == files[:3]
+    assert list((Pipeline / 'src' / 'a').filter_paths(files)) == files[:2]
+    assert list((Pipeline / 'a' / 'src').filter_paths(files)) == [files[0], files[2]]
+
+
+def test_plan():
+    from pathlib import Path as P
+    from palgen.ingest import Folder, Name, Suffix
+
+    class Extension:
+        root_path = P('/root')
+
+        def relative(self, files):
+            for file in files:
+                yield file.relative_to(self.root_path)
+        relative.rebases = True
+
+    pipeline = Pipeline >> Extension.relative >> Folder('src') >> Suffix('.py') >> Name('x.py') >> passthrough
+    plan = pipeline.plan[0].steps
+
+    assert str(plan[0]) == "Suffix('.py') & Name('x.py')"
+    assert plan[1:] == [Extension.relative, pipeline.tasks[0].steps[1], passthrough]
+    assert [str(step) for step in pipeline.filters] == ["Suffix('.py')", "Name('x.py')"]
+    assert "Suffix('.py') & Name('x.py') >> relative >> Folder('src')" in pipeline.explain()
+
+    files = [P('/root/src/x.py'), P('/root/src/y.py'), P('/root/lib/x.py'), P('/root/src/x.pyc')]
+    assert pipeline(files, obj=Extension()) == [P('src/x.py')]
+    assert pipeline([files[0]], obj=Extension(), selected=True) == [P('src/x.py')]
+
+
+def test_plan_barrier():
+    from pathlib import Path as P
+    from palgen.ingest import Filter, Name, Suffix
+
+    class Short(Filter):
+        # overrides `filter` instead of `test`, can only run as a step
+        def filter(self, files):
+            for file in files:
+                if len(file.stem) < 4:
+                    yield file
+
+    short = Short()
+    pipeline = Pipeline >> Suffix('.c') >> short >> Name('a.c') >> passthrough
+    assert not short.selectable
+    assert pipeline.plan[0].steps[1:3] == [short, pipeline.tasks[0].steps[2]]
+
+    files = [P('/src/a.c'), P('/src/long.c'), P('/src/a.h')]
+    assert pipeline(files) == [P('/src/a.c')]
+    assert list((Suffix('.c') & short)(files)) == [P('/src/a.c')]
+    assert list((Suffix('.h') | short)(files)) == [P('/src/a.c'), P('/src/a.h')]
+    assert list((~short)(files)) == [P('/src/long.c')]
+
+
+def test_partition_barrier():
+    from pathlib import Path as P
+    from palgen.ingest import Filter, Suffix
+    from palgen.machinery.pipeline import partition
+
+    class Short(Filter):
+        def filter(self, files):
+            for file in files:
+                if len(file.stem) < 4:
+                    yield file
+
+    files = [P('/src/a.c'), P('/src/long.c'), P('/src/a.h')]
+    pipeline = Pipeline >> Suffix('.c') >> Short() >> passthrough
+    assert [str(step) for step in pipeline.filters] == ["Suffix('.c')"]
+    assert pipeline.matcher()(files[1]) and not pipeline.matches(files[2])
+
+    selected = partition({'short': pipeline}, files)
+    assert selected == {'short': files[:2]}
+    assert pipeline(selected['short'], selected=True) == pipeline(files) == [P('/src/a.c')]
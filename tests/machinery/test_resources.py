@@ -0,0 +1,67 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from palgen.machinery.resources import cgroup_cpu_limit, cgroup_memory_limit, cpu_count
+
+
+def make_cgroup(root: Path, membership: str, files: dict[str, str]) -> Path:
+    proc = root / 'proc_cgroup'
+    proc.write_text(membership)
+
+    for name, content in files.items():
+        path = root / 'fs' / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+    return proc
+
+
+@pytest.mark.parametrize('content, expected', [
+    ('max 100000', None),
+    ('400000 100000', 4),
+    ('150000 100000', 2),
+    ('1000 100000', 1),
+])
+def test_cpu_v2(tmp_path: Path, content: str, expected):
+    proc = make_cgroup(tmp_path, '0::/docker/abc\n', {'docker/abc/cpu.max': content})
+    assert cgroup_cpu_limit(tmp_path / 'fs', proc) == expected
+
+
+def test_cpu_v2_parent(tmp_path: Path):
+    proc = make_cgroup(tmp_path, '0::/outer/inner\n', {'outer/cpu.max': '200000 100000',
+                                                       'outer/inner/cpu.max': 'max 100000'})
+    assert cgroup_cpu_limit(tmp_path / 'fs', proc) == 2
+
+
+@pytest.mark.parametrize('quota, expected', [('-1', None), ('300000', 3)])
+def test_cpu_v1(tmp_path: Path, quota: str, expected):
+    proc = make_cgroup(tmp_path, '4:cpu,cpuacct:/\n3:memory:/\n',
+                       {'cpu,cpuacct/cpu.cfs_quota_us': quota,
+                        'cpu,cpuacct/cpu.cfs_period_us': '100000'})
+    assert cgroup_cpu_limit(tmp_path / 'fs', proc) == expected
+
+
+def test_memory(tmp_path: Path):
+    proc = make_cgroup(tmp_path, '0::/\n', {'memory.max': 'max'})
+    assert cgroup_memory_limit(tmp_path / 'fs', proc) is None
+
+    proc = make_cgroup(tmp_path, '0::/\n', {'memory.max': '1073741824'})
+    assert cgroup_memory_limit(tmp_path / 'fs', proc) == 1073741824
+
+    proc = make_cgroup(tmp_path, '3:memory:/\n', {'memory/memory.limit_in_bytes': str(2 ** 63 - 4096)})
+    assert cgroup_memory_limit(tmp_path / 'fs', proc) is None
+
+
+def test_missing(tmp_path: Path):
+    assert cgroup_cpu_limit(tmp_path, tmp_path / 'missing') is None
+    assert cgroup_memory_limit(tmp_path, tmp_path / 'missing') is None
+
+
+def test_cpu_count():
+    count = cpu_count()
+    assert 1 <= count <= (os.cpu_count() or 1)
+
+    if hasattr(os, 'sched_getaffinity'):
+        assert count <= len(os.sched_getaffinity(0))
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from palgen.machinery import Pipeline
+from palgen.machinery.scheduler import Scheduler, WorkerPool, current_pool
+
+
+def square(data):
+    for datum in data:
+        yield datum * datum
+
+
+def test_order():
+    scheduler = Scheduler({'build': ['embed', 'missing'], 'embed': [], 'docs': ['build'], 'other': []})
+    order = scheduler.order()
+
+    assert order == ['embed', 'other', 'build', 'docs']
+    assert scheduler.dependencies['build'] == {'embed'}
+
+
+def test_cycle():
+    with pytest.raises(ValueError):
+        Scheduler({'foo': ['bar'], 'bar': ['baz'], 'baz': ['foo']})
+
+
+@pytest.mark.parametrize('jobs', [1, 4])
+def test_run(jobs: int):
+    finished: list[str] = []
+    lock = threading.Lock()
+
+    def run(name: str):
+        with lock:
+            finished.append(name)
+        return name.upper()
+
+    scheduler = Scheduler({'build': ['embed'], 'embed': [], 'docs': ['build', 'embed']}, jobs=jobs)
+    assert scheduler.run(run) == {'embed': 'EMBED', 'build': 'BUILD', 'docs': 'DOCS'}
+    assert finished == ['embed', 'build', 'docs']
+
+
+def test_concurrent():
+    # deadlocks unless both tasks run at the same time
+    barrier = threading.Barrier(2, timeout=5)
+
+    def run(name: str):
+        barrier.wait()
+        return name
+
+    assert Scheduler({'foo': [], 'bar': []}, jobs=2).run(run) == {'foo': 'foo', 'bar': 'bar'}
+
+
+def test_failure():
+    started: list[str] = []
+
+    def run(name: str):
+        started.append(name)
+        if name == 'foo':
+            raise RuntimeError("failed")
+        return name
+
+    with pytest.raises(RuntimeError):
+        Scheduler({'foo': [], 'bar': ['foo']}, jobs=2).run(run)
+
+    assert started == ['foo']
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_worker_pool(jobs: int):
+    pipeline = Pipeline >> square
+
+    assert current_pool() is None
+    with WorkerPool(jobs) as pool:
+        assert current_pool() is pool
+        assert sorted(pipeline(list(range(10)), max_jobs=4)) == [i * i for i in range(10)]
+
+    assert current_pool() is None
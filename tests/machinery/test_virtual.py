@@ -0,0 +1,41 @@
+import pickle
+from pathlib import Path
+
+from palgen.machinery.virtual import Generated
+
+
+def test_generated():
+    path = Generated.of('/project/build/foo.hpp', 'content')
+
+    assert path == Path('/project/build/foo.hpp')
+    assert path.exists() and path.is_file() and not path.is_dir()
+    assert path.read_text() == 'content'
+    assert path.read_bytes() == b'content'
+    assert path.open().read() == 'content'
+    assert path.open('rb').read() == b'content'
+
+
+def test_derived():
+    path = Generated.of('/project/build/foo.hpp', b'content')
+
+    relative = path.relative_to('/project')
+    assert isinstance(relative, Generated)
+    assert relative.read_bytes() == b'content'
+
+    absolute = Path('/other') / relative
+    assert isinstance(absolute, Generated)
+    assert absolute == Path('/other/build/foo.hpp')
+    assert absolute.read_text() == 'content'
+
+    # other derived paths do not refer to the same content
+    assert not path.parent.is_virtual
+    assert not path.with_suffix('.cpp').is_virtual
+
+
+def test_pickle():
+    path = Generated.of('/project/build/foo.hpp', 'content')
+    restored = pickle.loads(pickle.dumps(path))
+
+    assert isinstance(restored, Generated)
+    assert restored == path
+    assert restored.read_text() == 'content'
@@ -0,0 +1,118 @@
+import logging
+import os
+import pickle
+from pathlib import Path
+
+import pytest
+from pydantic import BaseModel, RootModel
+
+from palgen import Extension, Sources
+from palgen import interface
+from palgen.machinery.virtual import count_unchanged
+from palgen.schemas import ProjectSettings
+
+
+class Item(BaseModel):
+    name: str
+    size: int
+
+
+class Items(Extension):
+    Schema = Item
+
+
+class TrustedItems(Extension):
+    Schema = Item
+    trusted = True
+
+
+class Names(Extension):
+    Schema = RootModel[list[str]]
+    trusted = True
+
+
+def keep(files):
+    yield from files
+
+
+class Split(Extension):
+    pipeline = {'a': Sources >> keep, 'b': Sources >> keep}
+
+
+def make(extension: type[Extension]) -> Extension:
+    return extension(ProjectSettings(name='test'), Path('.'), Path('.'))
+
+
+@pytest.mark.parametrize('batch', [1, 2, 256])
+def test_validate(monkeypatch, caplog, batch: int):
+    monkeypatch.setattr(interface, 'VALIDATE_BATCH', batch)
+    data = [(Path(f'{idx}.toml'), {'name': f'item{idx}', 'size': str(idx)} if idx % 3 else {'name': idx})
+            for idx in range(7)]
+    data.append((Path('model.toml'), Item(name='model', size=1)))
+
+    with caplog.at_level(logging.WARNING):
+        validated = list(make(Items).validate(data))
+
+    assert validated == [(Path(f'{idx}.toml'), Item(name=f'item{idx}', size=idx)) for idx in (1, 2, 4, 5)] \
+        + [data[-1]]
+    assert validated[-1][1] is data[-1][1]
+
+    for idx in (0, 3, 6):
+        assert f'{idx}.toml failed validation.' in caplog.text
+    assert 'size' in caplog.text and 'missing' in caplog.text
+
+
+def test_trusted():
+    (path, item), = make(TrustedItems).validate([(Path('foo.toml'), {'name': 'foo', 'size': 'unchecked'})])
+    assert path == Path('foo.toml')
+    assert isinstance(item, Item) and item.size == 'unchecked'
+
+    (_, names), = make(Names).validate([(Path('names.toml'), ['a', 'b'])])
+    assert names.root == ['a', 'b']
+
+
+def test_adapter_cached():
+    assert interface._list_adapter(Item) is interface._list_adapter(Item)  # pylint: disable=protected-access
+
+
+def test_write(tmp_path: Path):
+    extension = Items(ProjectSettings(name='test'), tmp_path, tmp_path / 'out')
+    outputs = [(Path('foo.hpp'), 'int foo;\n'), (Path('sub/bar.bin'), b'\x00bar'), (Path('baz.hpp'), 'int baz;\n')]
+
+    assert list(extension.write(outputs)) == [tmp_path / 'out' / path for path, _ in outputs]
+    assert (tmp_path / 'out' / 'sub' / 'bar.bin').read_bytes() == b'\x00bar'
+
+    mtimes = {}
+    for path, _ in outputs:
+        os.utime(tmp_path / 'out' / path, ns=(0, 0))
+        mtimes[path] = (tmp_path / 'out' / path).stat().st_mtime_ns
+
+    # same size, different content
+    outputs[2] = (Path('baz.hpp'), 'int qux;\n')
+
+    written = list(extension.write(outputs))
+    assert written == [tmp_path / 'out' / path for path, _ in outputs]
+    assert [getattr(path, 'unchanged', False) for path in written] == [True, True, False]
+    assert count_unchanged(written) == 2
+
+    assert all((tmp_path / 'out' / path).stat().st_mtime_ns == mtimes[path] for path, _ in outputs[:2])
+    assert (tmp_path / 'out' / 'baz.hpp').read_text() == 'int qux;\n'
+
+    # the flag survives being sent back from worker processes
+    extension.handoff = True
+    assert count_unchanged(pickle.loads(pickle.dumps(list(extension.write(outputs))))) == 3
+
+
+@pytest.mark.parametrize('jobs, expected', [(None, 1), (1, 1), (2, 2), (8, 2)])
+def test_run_jobs(monkeypatch, jobs, expected):
+    used = []
+    run = interface.Scheduler.run
+
+    def record(scheduler, fnc):
+        used.append(scheduler.jobs)
+        return run(scheduler, fnc)
+
+    monkeypatch.setattr(interface.Scheduler, 'run', record)
+    files = [Path('foo.txt')]
+    assert make(Split).run(files, jobs=jobs) == files * 2
+    assert used == [expected]
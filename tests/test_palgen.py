@@ -1,6 +1,8 @@
-import pytest
+import logging
 from pathlib import Path
 
+import pytest
+
 from palgen import Palgen
 
 root = Path(__file__).parent.parent / "examples" / "tutorial"
@@ -12,3 +14,137 @@ def test_load(path: Path):
     assert project.root == root
     assert project == root / "palgen.toml"
     assert project == str(root / "palgen.toml")
+
+
+EXTENSIONS = '''
+from palgen import Extension, Sources
+from palgen.ingest import Suffix, Text
+from palgen.machinery.virtual import Generated
+
+
+class Producer(Extension):
+    ingest = Sources >> Suffix('.in') >> Text
+
+    def render(self, data):
+        for path, content in data:
+            yield path.with_suffix('.txt').name, content + " generated"
+
+
+class Shout(Extension):
+    consumes = ['producer']
+    ingest = Sources >> Suffix('.txt') >> Text
+
+    def render(self, data):
+        for path, content in data:
+            assert isinstance(path, Generated), f"{path} was not handed over in memory"
+            yield path.with_suffix('.out').name, content.upper()
+'''
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_consumes(tmp_path: Path, jobs: int):
+    (tmp_path / 'extensions').mkdir()
+    (tmp_path / 'extensions' / 'handoff.py').write_text(EXTENSIONS)
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'foo.in').write_text('foo')
+    (tmp_path / 'src' / 'bar.in').write_text('bar')
+
+    # consumers are listed first on purpose
+    (tmp_path / 'palgen.toml').write_text(f'''
+[project]
+name = "handoff{jobs}"
+sources = ["src"]
+
+[palgen]
+output = "build"
+jobs = {jobs}
+
+[palgen.extensions]
+folders = ["extensions"]
+inline = false
+
+[shout]
+[producer]
+''')
+
+    Palgen(tmp_path).run_all()
+
+    assert (tmp_path / 'build' / 'foo.txt').read_text() == 'foo generated'
+    assert (tmp_path / 'build' / 'foo.out').read_text() == 'FOO GENERATED'
+    assert (tmp_path / 'build' / 'bar.out').read_text() == 'BAR GENERATED'
+
+
+SHARED = '''
+from pathlib import Path
+
+from palgen import Extension, Sources
+from palgen.ingest import Suffix, Text
+
+
+class CountingText(Text):
+    __slots__ = ()
+
+    def load(self, file):
+        # workers are separate processes, count through the file system
+        with open(Path(__file__).parent.parent / 'parsed.log', 'a', encoding='utf-8') as log:
+            log.write(f"{file.name}\\n")
+        yield from super().load(file)
+
+
+class First(Extension):
+    ingest = Sources >> Suffix('.txt') >> CountingText
+
+    def render(self, data):
+        for path, content in data:
+            yield f'first/{path.name}', content
+
+
+class Second(Extension):
+    ingest = Sources >> Suffix('.txt') >> CountingText
+
+    def render(self, data):
+        for path, content in data:
+            yield f'second/{path.name}', content
+'''
+
+
+def test_memo_shared(tmp_path: Path, caplog):
+    (tmp_path / 'extensions').mkdir()
+    (tmp_path / 'extensions' / 'shared.py').write_text(SHARED)
+    (tmp_path / 'src').mkdir()
+    for idx in range(40):
+        (tmp_path / 'src' / f'{idx}.txt').write_text(str(idx))
+
+    (tmp_path / 'palgen.toml').write_text('''
+[project]
+name = "shared"
+sources = ["src"]
+
+[palgen]
+output = "build"
+jobs = 4
+
+[palgen.extensions]
+folders = ["extensions"]
+inline = false
+
+[first]
+[second]
+''')
+
+    Palgen(tmp_path).run_all()
+
+    assert len(list((tmp_path / 'build' / 'first').iterdir())) == 40
+    assert (tmp_path / 'build' / 'second' / '7.txt').read_text() == '7'
+
+    parsed = (tmp_path / 'parsed.log').read_text().split()
+    assert sorted(parsed) == sorted(f'{idx}.txt' for idx in range(40))
+
+
+    # a rerun leaves every output untouched and reports that once per extension
+    with caplog.at_level(logging.INFO):
+        Palgen(tmp_path).run_all()
+
+    assert caplog.text.count("Extension `first` yielded 40 files, skipped writing 40 unchanged") == 1
+    assert caplog.text.count("Extension `second` yielded 40 files, skipped writing 40 unchanged") == 1
+    assert "Generated 0 files, 80 unchanged." in caplog.text